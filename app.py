@@ -1,595 +1,802 @@
 import os
-import json
+import gc
+import sys
 import dash
-from dash import dcc, html, ctx
+from dash import dcc, html, ctx, Patch
 from dash.dependencies import Output, Input, State
-import pandas as pd
-import plotly.express as px
 import dash_bootstrap_components as dbc
+from flask import request, Response, has_request_context
+from data_store import GeoIndex, TrendIndex, MotivBarrierIndex
+from facts import FactTable
+from assets_io import DATA_DIR, asset_files, load_table
+from datasets import DatasetRegistry
+from figure_cache import FigureCache
+from render_pool import RenderPool
+from figure_bundle import open_bundle
+from metrics import CallbackMetrics
+from compression import ResponseCompressor, minify_figure
+from export import Exporter
+import clientside
+from geo import RegionGeometry
+from lazy_imports import LazyModule
+
+# imported on first use, not at startup (see lazy_imports.py)
+pd = LazyModule("pandas")
+px = LazyModule("plotly.express")
+go = LazyModule("plotly.graph_objects")
+np = LazyModule("numpy")
+pc = LazyModule("plotly.colors")
 
 
-# Loading JSON files
-data = pd.read_json("assets/Geo_interpolated_by_year.json")
-with open("assets/laender_999_geo.json", "r", encoding="utf-8") as file:
-    geojson_data = json.load(file)
 years = [2006,2012,2016,2022]
-regions = data['region'].unique()
+# volunteering types of the time-series columns, in legend order
+TREND_VOL_TYPES = ["any", "formal", "informal", "both_formal_and_informal", "formal_only", "informal_only"]
+
+# Per-card datasets, loaded on first use (columnar copies when present, see assets_io.py)
+# and pre-partitioned so callbacks look up slices instead of boolean-mask filtering
+# (the files each one is read from are watched for changes, see WATCH_ASSETS)
+datasets = DatasetRegistry()
+datasets.register("geo", lambda: GeoIndex(load_table("geo")), asset_files("geo"))
+# Simplified once; tolerance in degrees, 0 keeps the original outlines
+GEOJSON_PATH = os.path.join(DATA_DIR, "laender_999_geo.json")
+datasets.register("geometry", lambda: RegionGeometry.from_file(
+    GEOJSON_PATH,
+    tolerance=float(os.environ.get("GEOJSON_SIMPLIFY_TOLERANCE", 0.005)),
+    precision=int(os.environ.get("GEOJSON_PRECISION", 5)),
+), [GEOJSON_PATH])
+datasets.register("trend", lambda: TrendIndex(load_table("trend")), asset_files("trend"))
+datasets.register("motiv_barrier", lambda: MotivBarrierIndex(load_table("motiv_barrier")),
+                  asset_files("motiv_barrier"))
+# The nested assets as one long fact table (see facts.py), queried by the activity,
+# gender and error-bar cards
+FACT_ASSETS = ["activity_formal", "activity_informal", "gender", "error_bars"]
+datasets.register("facts", lambda: FactTable.from_tables({name: load_table(name) for name in FACT_ASSETS}),
+                  asset_files(*FACT_ASSETS))
+
+# Memoized figure builders that read each dataset, invalidated when it is reloaded
+DATASET_FIGURES = {
+    "geo": ["region_figures"],
+    "geometry": ["region_figures"],
+    "trend": ["time_series", "ts2_graph"],
+    "motiv_barrier": ["motiv_barrier"],
+    "facts": ["activity_stacked_bar", "gender_comparison", "errorBar"],
+}
 
-trend_data = pd.read_json("assets/volunteering_time_series_fake.json")  
 
-motiv_barrier_df = pd.read_json("assets/motivations_barriers_fake_data.json")
+app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
+server = app.server
 
-with open("assets/formal_volunteering_fake_data.json", "r", encoding="utf-8") as f:
-    formal_data_by_year = json.load(f)
+# COMPRESS_RESPONSES=1 gzips (or brotli-encodes) the Dash JSON responses; registered
+# first so it runs after the other after_request hooks, which see the plain body
+if os.environ.get("COMPRESS_RESPONSES", "0") == "1":
+    response_compressor = ResponseCompressor(
+        ["_dash-update-component", "_dash-layout", "_dash-dependencies", "regions.geojson", "lookups.json"],
+        min_bytes=int(os.environ.get("COMPRESS_MIN_BYTES", 1024)),
+        level=int(os.environ.get("COMPRESS_LEVEL", 6)),
+    )
+    server.after_request(response_compressor.after_request)
+
+# Rendered figures keyed by callback inputs; FIGURE_CACHE_MAX_BYTES=0 disables it
+figure_cache = FigureCache(int(os.environ.get("FIGURE_CACHE_MAX_BYTES", 64 * 1024 * 1024)))
+# Pre-rendered figures built by `python figure_bundle.py build`
+FIGURE_BUNDLE = os.environ.get("FIGURE_BUNDLE")
+figure_cache.bundle = open_bundle(FIGURE_BUNDLE)
+# Figures are rounded to FIGURE_PRECISION decimals and stripped of defaults; -1 turns it off
+FIGURE_PRECISION = int(os.environ.get("FIGURE_PRECISION", 4))
+if FIGURE_PRECISION >= 0:
+    figure_cache.postprocess = lambda figure: minify_figure(figure, FIGURE_PRECISION)
+
+
+def render_figure(name, args):
+    # what the figure cache stores for one builder call; also the render pool's task
+    return figure_cache.prepare(figure_cache.functions[name](*args))
+
+
+def load_render_worker():
+    # render pool process initializer: loads the datasets the pooled figures read before the
+    # first task, and nothing else (clientside_lookups would render the whole figure grid)
+    for name, figures in DATASET_FIGURES.items():
+        if render_pool.names & set(figures):
+            datasets[name]
+
+
+# RENDER_PROCESSES=<n> builds cache misses of the CPU-heavy cards in n worker
+# processes, so a burst of cold views uses more than one core (see render_pool.py)
+RENDER_PROCESSES = int(os.environ.get("RENDER_PROCESSES", 0))
+render_pool = None
+if RENDER_PROCESSES > 0:
+    render_pool = figure_cache.renderer = RenderPool(
+        render_figure,
+        RENDER_PROCESSES,
+        os.environ.get("RENDER_POOL_FIGURES", "region_figures,activity_stacked_bar,gender_comparison").split(","),
+        max_pending=int(os.environ.get("RENDER_QUEUE", 4 * RENDER_PROCESSES)),
+        timeout=float(os.environ.get("RENDER_TIMEOUT", 10)),
+        initializer=load_render_worker,
+    )
 
-with open("assets/informal_volunteering_fake_data.json", "r", encoding="utf-8") as f:
-    informal_data_by_year = json.load(f)
+# Serve the pure-lookup callbacks from the browser (see clientside.py)
+CLIENTSIDE_CALLBACKS = os.environ.get("CLIENTSIDE_CALLBACKS", "0") == "1"
+
+# Latency, phase and response-size histograms per callback (see metrics.py)
+callback_metrics = CallbackMetrics()
+server.after_request(callback_metrics.observe_response)
+
+
+def lookup_callback(*args, **kwargs):
+    # @app.callback for callbacks that clientside mode replaces
+    if CLIENTSIDE_CALLBACKS:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
+
+
+@server.route("/cache-stats")
+def cache_stats():
+    return dict(figure_cache.stats(), datasets=datasets.stats())
+
+
+@server.route("/metrics")
+def prometheus_metrics():
+    body = callback_metrics.render(figure_cache.stats(), datasets.stats())
+    return Response(body, mimetype="text/plain; version=0.0.4")
+
+
+# WARM_DATASETS=1 loads the remaining datasets in the background after the first request
+if os.environ.get("WARM_DATASETS", "0") == "1":
+    @server.before_request
+    def warm_datasets():
+        datasets.warm_in_background()
+
+
+def invalidate_figures(name):
+    # only the cards built from the reloaded dataset lose their cached figures
+    for callback_name in DATASET_FIGURES.get(name, []):
+        figure_cache.invalidate(callback_name)
+    if FIGURE_BUNDLE and name in DATASET_FIGURES:
+        # reopened and checked against the new assets: used again once it was rebuilt from them
+        figure_cache.bundle = open_bundle(FIGURE_BUNDLE)
+    if CLIENTSIDE_CALLBACKS and name in DATASET_FIGURES:
+        # rebuilt here in the watcher thread; the old lookups are served until it is done
+        try:
+            datasets.dataset("clientside_lookups").reload()
+        except Exception as err:  # noqa: BLE001 - keep serving the old lookups
+            print(f"rebuilding the clientside lookups failed: {err}", file=sys.stderr)
+    # the pool's processes hold their own copy of the old data
+    if render_pool is not None and render_pool.names & set(DATASET_FIGURES.get(name, [])):
+        render_pool.restart()
+
+
+datasets.add_listener(invalidate_figures)
+
+# the render pool is per worker, its processes start with the worker's first request
+if render_pool is not None:
+    @server.before_request
+    def start_render_pool():
+        render_pool.start()
+
+# WATCH_ASSETS=<seconds> polls the asset files and swaps in reloaded datasets;
+# started per worker with its first request, threads don't survive a fork
+WATCH_ASSETS = float(os.environ.get("WATCH_ASSETS", 0))
+if WATCH_ASSETS > 0:
+    @server.before_request
+    def watch_assets():
+        datasets.watch(WATCH_ASSETS)
+
+
+@server.route("/geometry/regions.geojson")
+def region_geojson():
+    # Fetched once by the browser; map figures only carry this URL
+    region_geometry = datasets["geometry"]
+    response = Response(region_geometry.json_bytes, mimetype="application/geo+json")
+    response.set_etag(region_geometry.etag)
+    response.cache_control.public = True
+    response.cache_control.max_age = 86400
+    return response.make_conditional(request)
+
+
+# GEOJSON_INLINE=1 embeds the geometry in every map figure (needed for static image export)
+GEOJSON_INLINE = os.environ.get("GEOJSON_INLINE", "0") == "1"
+
+
+def render_export_figure(name, args):
+    # undecorated builder, so batch image jobs don't churn the figure cache
+    year_range = None
+    if name in ("time_series", "ts2_graph") and len(args) == 4:
+        # the callback's arguments, ending with the slider's year range
+        *args, year_range = args
+    figures = render_figure(name, args)
+    if year_range:
+        figures = with_year_window(figures, name, args, year_range)
+    for figure in (figures if isinstance(figures, tuple) else (figures,)):
+        for trace in figure['data']:
+            # the image renderer can't fetch GEOJSON_URL
+            if isinstance(trace.get('geojson'), str):
+                trace['geojson'] = datasets["geometry"].geojson
+    return figures
+
+
+# /export/<card> streams card data as CSV or Parquet, /export/images renders batches of figures
+exporter = Exporter(
+    render_export_figure,
+    chunk_rows=int(os.environ.get("EXPORT_CHUNK_ROWS", 50000)),
+    image_workers=int(os.environ.get("EXPORT_IMAGE_WORKERS", 2)),
+)
+for card in ("geo", "trend", "motiv_barrier"):
+    exporter.register(card, lambda card=card: datasets[card].frame)
+# the nested assets as their rows of the fact table
+for card in ("activity", "gender", "error_bars"):
+    exporter.register(card, lambda card=card: datasets["facts"].query(card))
+exporter.register("facts", lambda: datasets["facts"].frame)
+exporter.init_app(server)
+GEOJSON_URL = app.get_relative_path("/geometry/regions.geojson")
+
+
+def serve_layout():
+    # Built per page load, so a worker only loads the datasets the layout needs.
+    # Dash also calls this once at import to validate component ids; that call
+    # happens outside a request and gets a layout without data.
+    if has_request_context():
+        ts_demographics = datasets["trend"].demographics
+        ts_years = datasets["trend"].years
+        mb_genders = datasets["motiv_barrier"].genders
+    else:
+        ts_demographics, ts_years, mb_genders = [""], [0], []
+    layout = dbc.Container([
+        # General page title
+        html.H1("Statistics of volunteering in Austria", className="text-center my-4 fw-bold"),
+        # Top-left Menu Button + collabsable Sidebar
+        html.Div([
+            dbc.Button(
+                "☰",  # Contents Icon
+                id="open-offcanvas",
+                n_clicks=0,
+                color="light",
+                style={"position": "fixed", "top": "20px", "left": "20px", "zIndex": 9999, "fontSize": "24px"}
+            ),
+            dbc.Offcanvas(
+                [
+                    html.H5("Contents", className="my-3"),
+                    dbc.Nav([
+                        dbc.NavLink("Geographic Distribution", href="#choropleth-card", external_link=True),
+                        dbc.NavLink("Time-Series Trends (demgraphic comparison)", href="#timeseries-card", external_link=True),
+                        dbc.NavLink("Time-Series Trends (volunteering type comparison", href="#ts2-time-series-card", external_link=True),
+                        dbc.NavLink("Motivations and Barriers to Volunteering", href="#motivation-barrier-card", external_link=True),
+                        dbc.NavLink("Volunteer Activity by Demographic Group", href="#activity-bar-card", external_link=True),
+                        dbc.NavLink("Gender comparison in Volunteering", href="#gender-comparison-card", external_link=True),
+                        dbc.NavLink("Volunteer Time Distribution", href="#errorBar-card", external_link=True),
+                    ], vertical=True)
+                ],
+                id="offcanvas",
+                is_open=False,
+                placement="start",   # Sidebar opens from the left
+                backdrop=True,       # Dim background when open
+                style={"width": "250px", "backgroundColor": "white"},
+            ),
+        ]),
 
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Geographic Distribution of Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
 
-with open("assets/gender_comparison_data_multiyear.json", "r", encoding="utf-8") as f:
-    gender_data_by_year = json.load(f)
+                # Filters in one row
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type of Volunteering", className="mb-1"),
+                        dcc.Dropdown(
+                            id="metric-dropdown",
+                            options=[
+                                {'label': 'Any', 'value': 'perc_volunteers_from_pop'},
+                                {'label': 'Formal', 'value': 'perc_formal_from_pop'},
+                                {'label': 'Informal', 'value': 'perc_informal_from_pop'}
+                            ],
+                            value='perc_volunteers_from_pop',
+                            style={'width': '100%'}
+                        ),
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Statistic", className="mb-1"),
+                        dcc.RadioItems(
+                            id="stat-type-radio",
+                            options=[
+                                {'label': 'Percentage', 'value': 'perc'},
+                                {'label': 'Avg Hours/week', 'value': 'avg_hours'},
+                                {'label': 'Median Hours', 'value': 'median_hours'}
+                            ],
+                            value='perc',
+                            labelStyle={'marginRight': '15px'}
+                        ),
+                    ], width=2, style={'paddingTop': 30}),
+
+                    dbc.Col([
+                        html.Label("Year", className="mb-1"),
+                        dcc.Dropdown(
+                            id='year-dropdown',
+                            options=[
+                                {"label": str(y), "value": y}
+                                for y in years
+                            ],
+                            value=int(max(years)),
+                            clearable=False
+                        )
 
-with open("assets/errorBars_data_multiyear.json", "r", encoding="utf-8") as f:
-    errorBars_data_by_year = json.load(f)
 
+                    ], width=2),
+                
+                    dbc.Col([
+                        dbc.Button("Reset to Austria", id="reset-button", color="primary", className="mt-3")
+                    ], width=2, style={'textAlign': 'right'}),
+                ], className='mb-4', align="center",justify="center"),
+
+                dbc.Row([
+                    dbc.Col(dcc.Graph(id='austria-map'), width=6),
+                    dbc.Col(dcc.Graph(id='region-boxplot'), width=6)
+                ]),
+                dbc.Row([
+                    dbc.Col(html.Div(id='data-insights', className='data-insights'), width=12)
+                ]),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),
+                        html.P("The above graph shows the distribution of volunteers across Austrian regions.The percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the total population above 15 years old from the selected region.")
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )
+
+            ])
+        ],id="choropleth-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+        # ... your existing layout above ...
+
+        # ---- Time Series Card ----
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Time-series trends of Volunteering across demographic categories", className="mb-4 mt-2 text-center fw-semibold"),
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type of Volunteering", className="mb-1"),
+                        dcc.Dropdown(
+                            id="ts-type-dropdown",
+                            options=[
+                                {'label': 'Any', 'value': 'any'},
+                                {'label': 'Formal', 'value': 'formal'},
+                                {'label': 'Informal', 'value': 'informal'},
+                                {'label': 'Both formal and informal', 'value': 'both_formal_and_informal'},
+                                {'label': 'Formal only', 'value': 'formal_only'},
+                                {'label': 'Informal only', 'value': 'informal_only'},
+                            ],
+                            value='any',
+                            clearable=False
+                        )
+                    ], width=2),                
+                    dbc.Col([
+                        html.Label("Demographic", className="mb-1"),
+                        dcc.Dropdown(
+                            id="ts-demographic-dropdown",
+                            options=[{'label': d.capitalize().replace("_", " "), 'value': d}
+                                    for d in ts_demographics],
+                            value='age',  # Set your preferred default
+                            clearable=False
+                        )
+                    ], width=2),
+                    dbc.Col([
+                        html.Label("Statistic", className="mb-1"),
+                        dcc.RadioItems(
+                            id="ts-radio",
+                            options=[
+                                {'label': 'Percentage', 'value': 'perc'},
+                                {'label': 'Count', 'value': 'count'}
+                            ],
+                            value='perc',
+                            labelStyle={'marginRight': '15px'}
+                        )
+                    ], width=2, style={'paddingTop': 8}),
+                    dbc.Col([
+                        html.Label("Year Range", className="mb-1"),
+                        dcc.RangeSlider(
+                            id="ts-year-slider",
+                            min=ts_years[0],
+                            max=ts_years[-1],
+                            value=[ts_years[0], ts_years[-1]],
+                            marks={y: str(y) for y in ts_years},
+                            step=None
+                        )
+                    ], width=4, style={'paddingTop': 12})
+                ], className='mb-4', align="center",justify="center"),
+                dcc.Graph(id="ts-line-graph"),
+                dbc.Alert(
+                    [   
+                        html.H6("Graph description", className="alert-heading"),
+                        html.P([
+                            "The above graph shows the time series trends of volunteering across different demographic categories through the years. ",
+                            "For the volunteering types (Any, Formal, Informal), the percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the number of residents in Austria who belong to the selected demographic category.",
+                            html.Br(), html.Br(),
+                            "However, for the volunteering types (Formal and Informal, Formal Only, Informal Only), the percentage is from the number of people from the selected demographic category who actually volunteered during the selected year.",
+                            html.Br(), html.Br(),
+                            "For instance:",
+                            html.Br(),
+                            "• Volunteering type = Formal, demographic = gender, statistic = percentage → percentage of men who did formal volunteering from all men in Austria.",
+                            html.Br(),
+                            "• Volunteering type = Formal only, demographic = gender, statistic = percentage → percentage of men who only did formal volunteering from all volunteering men in Austria."
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )            
+            ])
+
+        ],id="timeseries-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+
+        # ---- Time Series Comparison by Volunteering Type ----
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Time-series trends of Volunteering across volunteering types", className="mb-4 mt-2 text-center fw-semibold"),
+
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Demographic Dimension", className="mb-1"),
+                        dcc.Dropdown(
+                            id="ts2-demographic-dropdown",
+                            options=[
+                                {"label": d.capitalize().replace("_", " "), "value": d}
+                                for d in ts_demographics
+                            ],
+                            value=ts_demographics[0],
+                            clearable=False
+                        )
+                    ], width=2),
 
+                    dbc.Col([
+                        html.Label("Demographic Category", className="mb-1"),
+                        dcc.Dropdown(
+                            id="ts2-category-dropdown",
+                            options=[],  # will be populated via callback
+                            value=None,
+                            clearable=False
+                        )
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Statistic", className="mb-1"),
+                        dcc.RadioItems(
+                            id="ts2-radio",
+                            options=[
+                                {"label": "Percentage", "value": "perc"},
+                                {"label": "Count", "value": "count"}
+                            ],
+                            value="perc",
+                            labelStyle={"margin-right": "15px"}
+                        )
+                    ], width=2, style={'paddingTop': 8}),
+
+                    dbc.Col([
+                        html.Label("Year Range", className="mb-1"),
+                        dcc.RangeSlider(
+                            id="ts2-year-slider",
+                            min=ts_years[0],
+                            max=ts_years[-1],
+                            value=[
+                                ts_years[0],
+                                ts_years[-1]
+                            ],
+                            marks={
+                                y: str(y) for y in ts_years
+                            },
+                            step=None
+                        )
+                    ], width=4, style={'paddingTop': 12})
+                ], align= "center",justify="center",className='mb-4'),
+
+
+                dcc.Graph(id="ts2-line-graph"),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),                    
+                        html.P([
+                            "The above graph shows the time series trends of volunteering across different voluntering types through the years. ",
+                            "For the volunteering types (Any, Formal, Informal), the percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the number of residents in Austria who belong to the selected demographic category.",
+                            html.Br(), html.Br(),
+                            "However, for the volunteering types (Formal and Informal, Formal Only, Informal Only), the percentage is from the number of people from the selected demographic category who actually volunteered during the selected year."
+ 
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )                        
+
+            ])
+        ], id="ts2-time-series-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+
+
+        # ---- Diverging Bar Chart Card ----
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Motivations and Barriers to Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type", className="mb-1"),
+                        dcc.RadioItems(
+                            id="mb-type-radio",
+                            options=[
+                                {'label': 'Motivations', 'value': 'motivation'},
+                                {'label': 'Barriers', 'value': 'barrier'}
+                            ],
+                            value='motivation',
+                            labelStyle={'marginRight': '15px'}
+                        )
+                    ], width=2),
 
-app = dash.Dash(__name__, external_stylesheets=[dbc.themes.BOOTSTRAP])
-server = app.server
+                    dbc.Col([
+                        html.Label("Gender", className="mb-1"),
+                        dcc.Dropdown(
+                            id="mb-gender-dropdown",
+                            options=[{'label': g.capitalize(), 'value': g} for g in mb_genders],
+                            value='all',
+                            clearable=False
+                        )
+                    ], width=2),
 
-app.layout = dbc.Container([
-    # General page title
-    html.H1("Statistics of volunteering in Austria", className="text-center my-4 fw-bold"),
-    # Top-left Menu Button + collabsable Sidebar
-    html.Div([
-        dbc.Button(
-            "☰",  # Contents Icon
-            id="open-offcanvas",
-            n_clicks=0,
-            color="light",
-            style={"position": "fixed", "top": "20px", "left": "20px", "zIndex": 9999, "fontSize": "24px"}
-        ),
-        dbc.Offcanvas(
-            [
-                html.H5("Contents", className="my-3"),
-                dbc.Nav([
-                    dbc.NavLink("Geographic Distribution", href="#choropleth-card", external_link=True),
-                    dbc.NavLink("Time-Series Trends (demgraphic comparison)", href="#timeseries-card", external_link=True),
-                    dbc.NavLink("Time-Series Trends (volunteering type comparison", href="#ts2-time-series-card", external_link=True),
-                    dbc.NavLink("Motivations and Barriers to Volunteering", href="#motivation-barrier-card", external_link=True),
-                    dbc.NavLink("Volunteer Activity by Demographic Group", href="#activity-bar-card", external_link=True),
-                    dbc.NavLink("Gender comparison in Volunteering", href="#gender-comparison-card", external_link=True),
-                    dbc.NavLink("Volunteer Time Distribution", href="#errorBar-card", external_link=True),
-                ], vertical=True)
-            ],
-            id="offcanvas",
-            is_open=False,
-            placement="start",   # Sidebar opens from the left
-            backdrop=True,       # Dim background when open
-            style={"width": "250px", "backgroundColor": "white"},
-        ),
-    ]),
-
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Geographic Distribution of Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
-
-            # Filters in one row
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type of Volunteering", className="mb-1"),
-                    dcc.Dropdown(
-                        id="metric-dropdown",
-                        options=[
-                            {'label': 'Any', 'value': 'perc_volunteers_from_pop'},
-                            {'label': 'Formal', 'value': 'perc_formal_from_pop'},
-                            {'label': 'Informal', 'value': 'perc_informal_from_pop'}
-                        ],
-                        value='perc_volunteers_from_pop',
-                        style={'width': '100%'}
-                    ),
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Statistic", className="mb-1"),
-                    dcc.RadioItems(
-                        id="stat-type-radio",
-                        options=[
-                            {'label': 'Percentage', 'value': 'perc'},
-                            {'label': 'Avg Hours/week', 'value': 'avg_hours'},
-                            {'label': 'Median Hours', 'value': 'median_hours'}
-                        ],
-                        value='perc',
-                        labelStyle={'marginRight': '15px'}
-                    ),
-                ], width=2, style={'paddingTop': 30}),
-
-                dbc.Col([
-                    html.Label("Year", className="mb-1"),
-                    dcc.Dropdown(
-                        id='year-dropdown',
-                        options=[
-                            {"label": str(y), "value": y}
-                            for y in years
-                        ],
-                        value=int(max(years)),
-                        clearable=False
-                    )
-
-
-                ], width=2),
-                
-                dbc.Col([
-                    dbc.Button("Reset to Austria", id="reset-button", color="primary", className="mt-3")
-                ], width=2, style={'textAlign': 'right'}),
-            ], className='mb-4', align="center",justify="center"),
-
-            dbc.Row([
-                dbc.Col(dcc.Graph(id='austria-map'), width=6),
-                dbc.Col(dcc.Graph(id='region-boxplot'), width=6)
-            ]),
-            dbc.Row([
-                dbc.Col(html.Div(id='data-insights', className='data-insights'), width=12)
-            ]),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),
-                    html.P("The above graph shows the distribution of volunteers across Austrian regions.The percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the total population above 15 years old from the selected region.")
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )
-
-        ])
-    ],id="choropleth-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-    # ... your existing layout above ...
-
-    # ---- Time Series Card ----
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Time-series trends of Volunteering across demographic categories", className="mb-4 mt-2 text-center fw-semibold"),
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type of Volunteering", className="mb-1"),
-                    dcc.Dropdown(
-                        id="ts-type-dropdown",
-                        options=[
-                            {'label': 'Any', 'value': 'any'},
-                            {'label': 'Formal', 'value': 'formal'},
-                            {'label': 'Informal', 'value': 'informal'},
-                            {'label': 'Both formal and informal', 'value': 'both_formal_and_informal'},
-                            {'label': 'Formal only', 'value': 'formal_only'},
-                            {'label': 'Informal only', 'value': 'informal_only'},
-                        ],
-                        value='any',
-                        clearable=False
-                    )
-                ], width=2),                
-                dbc.Col([
-                    html.Label("Demographic", className="mb-1"),
-                    dcc.Dropdown(
-                        id="ts-demographic-dropdown",
-                        options=[{'label': d.capitalize().replace("_", " "), 'value': d}
-                                for d in sorted(trend_data['demographic'].unique())],
-                        value='age',  # Set your preferred default
-                        clearable=False
-                    )
-                ], width=2),
-                dbc.Col([
-                    html.Label("Statistic", className="mb-1"),
-                    dcc.RadioItems(
-                        id="ts-radio",
-                        options=[
-                            {'label': 'Percentage', 'value': 'perc'},
-                            {'label': 'Count', 'value': 'count'}
-                        ],
-                        value='perc',
-                        labelStyle={'marginRight': '15px'}
-                    )
-                ], width=2, style={'paddingTop': 8}),
-                dbc.Col([
-                    html.Label("Year Range", className="mb-1"),
-                    dcc.RangeSlider(
-                        id="ts-year-slider",
-                        min=int(trend_data['year'].min()),
-                        max=int(trend_data['year'].max()),
-                        value=[int(trend_data['year'].min()), int(trend_data['year'].max())],
-                        marks={int(y): str(int(y)) for y in sorted(trend_data['year'].unique())},
-                        step=None
-                    )
-                ], width=4, style={'paddingTop': 12})
-            ], className='mb-4', align="center",justify="center"),
-            dcc.Graph(id="ts-line-graph"),
-            dbc.Alert(
-                [   
-                    html.H6("Graph description", className="alert-heading"),
-                    html.P([
-                        "The above graph shows the time series trends of volunteering across different demographic categories through the years. ",
-                        "For the volunteering types (Any, Formal, Informal), the percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the number of residents in Austria who belong to the selected demographic category.",
-                        html.Br(), html.Br(),
-                        "However, for the volunteering types (Formal and Informal, Formal Only, Informal Only), the percentage is from the number of people from the selected demographic category who actually volunteered during the selected year.",
-                        html.Br(), html.Br(),
-                        "For instance:",
-                        html.Br(),
-                        "• Volunteering type = Formal, demographic = gender, statistic = percentage → percentage of men who did formal volunteering from all men in Austria.",
-                        html.Br(),
-                        "• Volunteering type = Formal only, demographic = gender, statistic = percentage → percentage of men who only did formal volunteering from all volunteering men in Austria."
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )            
-        ])
-
-    ],id="timeseries-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-
-    # ---- Time Series Comparison by Volunteering Type ----
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Time-series trends of Volunteering across volunteering types", className="mb-4 mt-2 text-center fw-semibold"),
-
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Demographic Dimension", className="mb-1"),
-                    dcc.Dropdown(
-                        id="ts2-demographic-dropdown",
-                        options=[
-                            {"label": d.capitalize().replace("_", " "), "value": d}
-                            for d in sorted(trend_data["demographic"].unique())
-                        ],
-                        value=sorted(trend_data["demographic"].unique())[0],
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Demographic Category", className="mb-1"),
-                    dcc.Dropdown(
-                        id="ts2-category-dropdown",
-                        options=[],  # will be populated via callback
-                        value=None,
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Statistic", className="mb-1"),
-                    dcc.RadioItems(
-                        id="ts2-radio",
-                        options=[
-                            {"label": "Percentage", "value": "perc"},
-                            {"label": "Count", "value": "count"}
-                        ],
-                        value="perc",
-                        labelStyle={"margin-right": "15px"}
-                    )
-                ], width=2, style={'paddingTop': 8}),
-
-                dbc.Col([
-                    html.Label("Year Range", className="mb-1"),
-                    dcc.RangeSlider(
-                        id="ts2-year-slider",
-                        min=int(trend_data["year"].min()),
-                        max=int(trend_data["year"].max()),
-                        value=[
-                            int(trend_data["year"].min()),
-                            int(trend_data["year"].max())
-                        ],
-                        marks={
-                            int(y): str(int(y)) for y in sorted(trend_data["year"].unique())
-                        },
-                        step=None
-                    )
-                ], width=4, style={'paddingTop': 12})
-            ], align= "center",justify="center",className='mb-4'),
-
-
-            dcc.Graph(id="ts2-line-graph"),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),                    
-                    html.P([
-                        "The above graph shows the time series trends of volunteering across different voluntering types through the years. ",
-                        "For the volunteering types (Any, Formal, Informal), the percentages represent the proportion of people who have participated in the selected volunteering type during the selected year from the number of residents in Austria who belong to the selected demographic category.",
-                        html.Br(), html.Br(),
-                        "However, for the volunteering types (Formal and Informal, Formal Only, Informal Only), the percentage is from the number of people from the selected demographic category who actually volunteered during the selected year."
- 
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )                        
-
-        ])
-    ], id="ts2-time-series-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-
-
-    # ---- Diverging Bar Chart Card ----
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Motivations and Barriers to Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type", className="mb-1"),
-                    dcc.RadioItems(
-                        id="mb-type-radio",
-                        options=[
-                            {'label': 'Motivations', 'value': 'motivation'},
-                            {'label': 'Barriers', 'value': 'barrier'}
-                        ],
-                        value='motivation',
-                        labelStyle={'marginRight': '15px'}
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Gender", className="mb-1"),
-                    dcc.Dropdown(
-                        id="mb-gender-dropdown",
-                        options=[{'label': g.capitalize(), 'value': g} for g in motiv_barrier_df['gender'].unique()],
-                        value='all',
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Year", className="mb-1"),
-                    dcc.Dropdown(
-                        id="mb-year-dropdown",
-                        options=[
-                            {"label": str(y), "value": y} for y in years
-                        ],
-                        value=max(years),
-                        clearable=False
-                    )
-
-                ], width=2)
-            ], align="center", justify="center",className='mb-4'),
-
-            dcc.Graph(id="mb-diverging-bar"),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),                    
-                    html.P([
-                        "The above graph shows the reasons that motivated people who volunteered in the selected year and the barriers that faced people who did not volunteer in the selected year, sorted by 'strongly agree'." 
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )                        
-        ])
-    ], id="motivation-barrier-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-
-    # --- Stacked Bar Chart Card ---
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Volunteer Activity by Demographic Group", className="mb-4 mt-2 text-center fw-semibold"),
-
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type of Volunteering", className="mb-1"),
-                    dcc.Dropdown(
-                        id="activity-type-dropdown",
-                        options=[
-                            {"label": "Formal", "value": "formal"},
-                            {"label": "Informal", "value": "informal"}
-                        ],
-                        value="formal",
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Demographic", className="mb-1"),
-                    dcc.Dropdown(
-                        id="activity-demographic-dropdown",
-                        options=[
-                            {"label": "Total", "value": "Total"},
-                            {"label": "Gender", "value": "Gender"},
-                            {"label": "Education", "value": "Education"},
-                            {"label": "Frequency of Volunteering", "value": "Freq_of_volunteering"},
-                            {"label": "Age", "value": "Age"},
-                        ],
-                        value="Gender",
-                        clearable=False
-                    )
-                ], width=2),
-                dbc.Col([
-                    html.Label("Statistic", className="mb-1"),
-                    dcc.RadioItems(
-                        id="activity-display-mode",
-                        options=[
-                            {"label": "Percentage", "value": "percent"},                            
-                            {"label": "Count", "value": "count"}
-                        ],
-                        value="percent",
-                        labelStyle={ 'marginRight': '15px'}
-                    )
-                ], width=2),
-                dbc.Col([
-                    html.Label("Year", className="mb-1"),
-                    dcc.Dropdown(
-                        id="activity-year-dropdown",
-                        options=[
-                            {"label": str(y), "value": y} for y in years
-                        ],
-                        value=max(years),
-                        clearable=False
-                    )
-
-                ],width=2)
-
-            ], align="center", justify="center",className='mb-4'),
+                    dbc.Col([
+                        html.Label("Year", className="mb-1"),
+                        dcc.Dropdown(
+                            id="mb-year-dropdown",
+                            options=[
+                                {"label": str(y), "value": y} for y in years
+                            ],
+                            value=max(years),
+                            clearable=False
+                        )
+
+                    ], width=2)
+                ], align="center", justify="center",className='mb-4'),
+
+                dcc.Graph(id="mb-diverging-bar"),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),                    
+                        html.P([
+                            "The above graph shows the reasons that motivated people who volunteered in the selected year and the barriers that faced people who did not volunteer in the selected year, sorted by 'strongly agree'." 
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )                        
+            ])
+        ], id="motivation-barrier-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+
+        # --- Stacked Bar Chart Card ---
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Volunteer Activity by Demographic Group", className="mb-4 mt-2 text-center fw-semibold"),
+
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type of Volunteering", className="mb-1"),
+                        dcc.Dropdown(
+                            id="activity-type-dropdown",
+                            options=[
+                                {"label": "Formal", "value": "formal"},
+                                {"label": "Informal", "value": "informal"}
+                            ],
+                            value="formal",
+                            clearable=False
+                        )
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Demographic", className="mb-1"),
+                        dcc.Dropdown(
+                            id="activity-demographic-dropdown",
+                            options=[
+                                {"label": "Total", "value": "Total"},
+                                {"label": "Gender", "value": "Gender"},
+                                {"label": "Education", "value": "Education"},
+                                {"label": "Frequency of Volunteering", "value": "Freq_of_volunteering"},
+                                {"label": "Age", "value": "Age"},
+                            ],
+                            value="Gender",
+                            clearable=False
+                        )
+                    ], width=2),
+                    dbc.Col([
+                        html.Label("Statistic", className="mb-1"),
+                        dcc.RadioItems(
+                            id="activity-display-mode",
+                            options=[
+                                {"label": "Percentage", "value": "percent"},                            
+                                {"label": "Count", "value": "count"}
+                            ],
+                            value="percent",
+                            labelStyle={ 'marginRight': '15px'}
+                        )
+                    ], width=2),
+                    dbc.Col([
+                        html.Label("Year", className="mb-1"),
+                        dcc.Dropdown(
+                            id="activity-year-dropdown",
+                            options=[
+                                {"label": str(y), "value": y} for y in years
+                            ],
+                            value=max(years),
+                            clearable=False
+                        )
+
+                    ],width=2)
+
+                ], align="center", justify="center",className='mb-4'),
             
-            dcc.Graph(id="activity-stacked-bar"),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),                    
-                    html.P([
-                        "The above graph shows the distribution of formal / informal volunteers across volunteering activities.", 
-                        html.Br(), html.Br(),
-                        "i.e, each bar shows the percentage of voluneers who do each activity from all volunteers who do the selected volunteering type in the selected year, and filtering by demagrahpics divides these percentages further by demographic categories." 
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )                        
-        ])
-    ], id="activity-bar-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-
-    # ---- Gender Comparison Card ----
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Gender Comparison in Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
-
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type of Volunteering", className="mb-1"),
-                    dcc.Dropdown(
-                        id="gender-type-dropdown",
-                        options=[
-                            {"label": "Formal", "value": "Formal"},
-                            {"label": "Informal", "value": "Informal"}
-                        ],
-                        value="Formal",
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Dimension", className="mb-1"),
+                dcc.Graph(id="activity-stacked-bar"),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),                    
+                        html.P([
+                            "The above graph shows the distribution of formal / informal volunteers across volunteering activities.", 
+                            html.Br(), html.Br(),
+                            "i.e, each bar shows the percentage of voluneers who do each activity from all volunteers who do the selected volunteering type in the selected year, and filtering by demagrahpics divides these percentages further by demographic categories." 
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )                        
+            ])
+        ], id="activity-bar-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+
+        # ---- Gender Comparison Card ----
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Gender Comparison in Volunteering", className="mb-4 mt-2 text-center fw-semibold"),
+
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type of Volunteering", className="mb-1"),
                         dcc.Dropdown(
-                            id="gender-dimension-dropdown",
-                            options=[],  # Initially empty
-                            value=None,
+                            id="gender-type-dropdown",
+                            options=[
+                                {"label": "Formal", "value": "Formal"},
+                                {"label": "Informal", "value": "Informal"}
+                            ],
+                            value="Formal",
                             clearable=False
                         )
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Dimension", className="mb-1"),
+                            dcc.Dropdown(
+                                id="gender-dimension-dropdown",
+                                options=[],  # Initially empty
+                                value=None,
+                                clearable=False
+                            )
+
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Statistic", className="mb-1"),
+                        dcc.RadioItems(
+                            id="gender-display-mode",
+                            options=[
+                                {"label": "Percentage", "value": "percent"},                            
+                                {"label": "Count", "value": "count"}
+
+                            ],
+                            value="percent",
+                            labelStyle={ 'marginRight': '15px'}
+                        )
+                    ], width=2),
 
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Statistic", className="mb-1"),
-                    dcc.RadioItems(
-                        id="gender-display-mode",
-                        options=[
-                            {"label": "Percentage", "value": "percent"},                            
-                            {"label": "Count", "value": "count"}
-
-                        ],
-                        value="percent",
-                        labelStyle={ 'marginRight': '15px'}
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Year", className="mb-1"),
-                    dcc.Dropdown(
-                        id="gender-year-dropdown",
-                        options=[
-                            {"label": str(y), "value": y} for y in years
-                        ],
-                        value=max(years),
-                        clearable=False
-                    )
-
-                ], width=2)
-            ], align="center", justify="center",className='mb-4'),
-
-            dcc.Graph(id="gender-comparison-bar"),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),                    
-                    html.P([
-                        "The above graph compares the contribution of men vs women in volunteering.", 
-                        html.Br(),
-                        "The bars show the percentage of contribution of each gender from all volunteers in the selected year, type of volunteering, and dimension category "
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )                  
+                    dbc.Col([
+                        html.Label("Year", className="mb-1"),
+                        dcc.Dropdown(
+                            id="gender-year-dropdown",
+                            options=[
+                                {"label": str(y), "value": y} for y in years
+                            ],
+                            value=max(years),
+                            clearable=False
+                        )
+
+                    ], width=2)
+                ], align="center", justify="center",className='mb-4'),
+
+                dcc.Graph(id="gender-comparison-bar"),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),                    
+                        html.P([
+                            "The above graph compares the contribution of men vs women in volunteering.", 
+                            html.Br(),
+                            "The bars show the percentage of contribution of each gender from all volunteers in the selected year, type of volunteering, and dimension category "
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )                  
       
-        ])
-    ], id="gender-comparison-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
-    # ---- Boxplot Card ----
-    dbc.Card([
-        dbc.CardBody([
-            html.H4("Volunteer Time Distribution", className="mb-4 mt-2 text-center fw-semibold"),
-
-            dbc.Row([
-                dbc.Col([
-                    html.Label("Type of Volunteering", className="mb-1"),
-                    dcc.Dropdown(
-                        id="errorBar-voltype-dropdown",
-                        options=[
-                            {"label": "Any", "value": "Total"},
-                            {"label": "Formal", "value": "Formal"},
-                            {"label": "Informal", "value": "Informal"}
-                        ],
-                        value="Total",
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Demographic", className="mb-1"),
-                    dcc.Dropdown(
-                        id="errorBar-demographic-dropdown",
-                        options=[
-                            {"label": "Total", "value": "Total"},
-                            {"label": "Gender", "value": "Gender"},
-                            {"label": "Age", "value": "Age"},
-                            {"label": "Education", "value": "Education"},
-                            {"label": "Migration Background", "value": "MigrationBackground"},
-                            {"label": "Employment", "value": "Employment"},
-                            {"label": "Municipality Size", "value": "MunicipalitySize"},
-                            {"label": "Region", "value": "Region"},
-                            {"label": "Task Type", "value": "TaskType"}
-                        ],
-                        value="Total",
-                        clearable=False
-                    )
-                ], width=2),
-
-                dbc.Col([
-                    html.Label("Year", className="mb-1"),
-                    dcc.Dropdown(
-                        id="errorBar-year-dropdown",
-                        options=[
-                            {"label": str(y), "value": y} for y in years
-                        ],
-                        value=max(years),
-                        clearable=False
-                    )
-                ], width=2)
-            ], align="center", justify="center",className='mb-4'),
-
-            dcc.Graph(id="errorBar-figure"),
-            dbc.Alert(
-                [
-                    html.H6("Graph description", className="alert-heading"),                    
-                    html.P([
-                        "The above graph compares weekly time spent on different volunteering types by each demographic category.The height of each bar indicates the median volunteering time, while the black diamond marker shows the mean (average) value. The error bars extending from the diamond represent the interquartile range, capturing the spread between the 25th and 75th percentiles. ", 
-                        #html.Br(),
+            ])
+        ], id="gender-comparison-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+        # ---- Boxplot Card ----
+        dbc.Card([
+            dbc.CardBody([
+                html.H4("Volunteer Time Distribution", className="mb-4 mt-2 text-center fw-semibold"),
+
+                dbc.Row([
+                    dbc.Col([
+                        html.Label("Type of Volunteering", className="mb-1"),
+                        dcc.Dropdown(
+                            id="errorBar-voltype-dropdown",
+                            options=[
+                                {"label": "Any", "value": "Total"},
+                                {"label": "Formal", "value": "Formal"},
+                                {"label": "Informal", "value": "Informal"}
+                            ],
+                            value="Total",
+                            clearable=False
+                        )
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Demographic", className="mb-1"),
+                        dcc.Dropdown(
+                            id="errorBar-demographic-dropdown",
+                            options=[
+                                {"label": "Total", "value": "Total"},
+                                {"label": "Gender", "value": "Gender"},
+                                {"label": "Age", "value": "Age"},
+                                {"label": "Education", "value": "Education"},
+                                {"label": "Migration Background", "value": "MigrationBackground"},
+                                {"label": "Employment", "value": "Employment"},
+                                {"label": "Municipality Size", "value": "MunicipalitySize"},
+                                {"label": "Region", "value": "Region"},
+                                {"label": "Task Type", "value": "TaskType"}
+                            ],
+                            value="Total",
+                            clearable=False
+                        )
+                    ], width=2),
+
+                    dbc.Col([
+                        html.Label("Year", className="mb-1"),
+                        dcc.Dropdown(
+                            id="errorBar-year-dropdown",
+                            options=[
+                                {"label": str(y), "value": y} for y in years
+                            ],
+                            value=max(years),
+                            clearable=False
+                        )
+                    ], width=2)
+                ], align="center", justify="center",className='mb-4'),
+
+                dcc.Graph(id="errorBar-figure"),
+                dbc.Alert(
+                    [
+                        html.H6("Graph description", className="alert-heading"),                    
+                        html.P([
+                            "The above graph compares weekly time spent on different volunteering types by each demographic category.The height of each bar indicates the median volunteering time, while the black diamond marker shows the mean (average) value. The error bars extending from the diamond represent the interquartile range, capturing the spread between the 25th and 75th percentiles. ", 
+                            #html.Br(),
                         
-                    ])                                               
-                ],
-                color="light",
-                style={"border": "1px solid #ccc", "marginTop": "10px"}
-            )
-        ])
-    ], id="errorBar-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
+                        ])                                               
+                    ],
+                    color="light",
+                    style={"border": "1px solid #ccc", "marginTop": "10px"}
+                )
+            ])
+        ], id="errorBar-card", className="mb-5 shadow-sm border-0",style={"backgroundColor": "#f8f9fa"}),
 
 
 
 
 
-    # dcc.Store for region selection
-    dcc.Store(id='selected-region', data='Austria'),
+        # dcc.Store for region selection
+        dcc.Store(id='selected-region', data='Austria'),
+
+        # Placeholder for future visualisations
+        html.Div(id="other-sections-placeholder"),
+    ], fluid=True)
+    if CLIENTSIDE_CALLBACKS:
+        layout.children.append(clientside.url_store(app))
+    return layout
 
-    # Placeholder for future visualisations
-    html.Div(id="other-sections-placeholder"),
-], fluid=True)
 
 def resolve_column(metric_value, stat_type_value):
     if metric_value == 'perc_volunteers_from_pop':
@@ -610,11 +817,12 @@ def resolve_column(metric_value, stat_type_value):
         return metric_value
     
 
-@app.callback(
+@lookup_callback(
     Output("offcanvas", "is_open"),
     Input("open-offcanvas", "n_clicks"),
     State("offcanvas", "is_open"),
 )
+@callback_metrics.instrument("offcanvas")
 def toggle_offcanvas(n, is_open):
     if n:
         return not is_open
@@ -622,11 +830,12 @@ def toggle_offcanvas(n, is_open):
 
 
 
-import plotly.graph_objects as go
-
+# One callback for the whole geographic card: a metric/stat/year change used to
+# fire a second request just for the insights panel.
 @app.callback(
     Output('region-boxplot', 'figure'),
     Output('austria-map', 'figure'),
+    Output('data-insights', 'children'),
     Output('selected-region', 'data'),
     Input('austria-map', 'clickData'),
     Input('metric-dropdown', 'value'),
@@ -636,20 +845,81 @@ import plotly.graph_objects as go
     State('selected-region', 'data'),
     prevent_initial_call=False
 )
+@callback_metrics.instrument("visuals")
 def update_visuals(click_data, metric_value, stat_type, year, reset_clicks, current_region):
     triggered = ctx.triggered_id
+    geo_index = datasets["geo"]
 
     if triggered == "reset-button":
         new_region = "Austria"
     elif triggered == "austria-map" and click_data and click_data.get('points') and 'location' in click_data['points'][0]:
         new_region = click_data['points'][0]['location']
-    elif current_region in regions:
+    elif current_region in geo_index.regions:
         new_region = current_region
     else:
         new_region = "Austria"
 
-    # Filter data for year
-    d_year = data[data['year'] == int(year)]
+    if not geo_index.has_region(year, new_region):
+        new_region = "Austria"
+    region_only = triggered in ("austria-map", "reset-button")
+    insights = dash.no_update if region_only else build_insights(metric_value, stat_type, year)
+    callback_metrics.mark("select")
+
+    fig, fig_map = build_region_figures(new_region, metric_value, stat_type, year)
+    callback_metrics.mark("figure")
+    if triggered is None:
+        # initial render: the browser has no figures yet
+        return fig, fig_map, insights, new_region
+    # The map geometry and both templates are already in the browser; a click or
+    # reset only moves the selection, the map's colours stay as they are
+    if region_only:
+        map_patch = patch_figure(fig_map, (), ('title', 'geo'))
+    else:
+        map_patch = patch_figure(fig_map, ('z', 'locations', 'hovertemplate'), ('title', 'coloraxis', 'geo'))
+    return (
+        patch_figure(fig, None, ('title',)),
+        map_patch,
+        insights,
+        new_region,
+    )
+
+
+def build_insights(metric_value, stat_type, year):
+    column = resolve_column(metric_value, stat_type)
+    (highest, highest_value), (lowest, lowest_value) = datasets["geo"].highest_lowest(year, column)
+
+    label_map = {
+        'perc': '% of Population',
+        'avg_hours': 'Average Weekly Hours',
+        'median_hours': 'Median Weekly Hours'
+    }
+
+    return [
+        #html.H4(f"Year: {year}"),
+        html.H5(f"Highest: {highest} ({highest_value} {label_map[stat_type]})"),
+        html.H5(f"Lowest: {lowest} ({lowest_value} {label_map[stat_type]})")
+    ]
+
+
+def patch_figure(figure, trace_keys, layout_keys):
+    # Patch carrying only the given keys of a figure dict; trace_keys=None replaces all traces
+    patched = Patch()
+    if trace_keys is None:
+        patched['data'] = figure['data']
+    else:
+        for i, trace in enumerate(figure['data']):
+            for key in trace_keys:
+                patched['data'][i][key] = trace.get(key)
+    for key in layout_keys:
+        patched['layout'][key] = figure['layout'].get(key)
+    return patched
+
+
+@figure_cache.memoize("region_figures")
+def build_region_figures(new_region, metric_value, stat_type, year):
+    geo_index = datasets["geo"]
+    # Data for the selected year
+    d_year = geo_index.year(year)
 
     prefix = {
         'perc_volunteers_from_pop': 'vlntrs',
@@ -658,13 +928,9 @@ def update_visuals(click_data, metric_value, stat_type, year, reset_clicks, curr
     }[metric_value]
 
     # Error bar chart (replaces boxplot)
-    if new_region not in d_year['region'].values:
-        new_region = "Austria"
-
-    q1 = d_year.loc[d_year['region'] == new_region, f'25_hrs_{prefix}'].values[0]
-    median = d_year.loc[d_year['region'] == new_region, f'median_hours_{prefix}'].values[0]
-    q3 = d_year.loc[d_year['region'] == new_region, f'75_hrs_{prefix}'].values[0]
-    avg = d_year.loc[d_year['region'] == new_region, f'avg_hours_{prefix}'].values[0]
+    q1, median, q3, avg = geo_index.row(
+        year, new_region, f'25_hrs_{prefix}', f'median_hours_{prefix}', f'75_hrs_{prefix}', f'avg_hours_{prefix}'
+    )
 
     fig = go.Figure()
 
@@ -723,7 +989,7 @@ def update_visuals(click_data, metric_value, stat_type, year, reset_clicks, curr
 
     # --- Choropleth map as in your current code ---
     column = resolve_column(metric_value, stat_type)
-    value = d_year.loc[d_year['region'] == new_region, column].values[0]
+    value = geo_index.value(year, new_region, column)
 
     # Determine unit for labeling
     label_map = {
@@ -736,27 +1002,23 @@ def update_visuals(click_data, metric_value, stat_type, year, reset_clicks, curr
     fig_map = px.choropleth(
         d_year,
         locations="region",
-        geojson=geojson_data,
+        geojson=datasets["geometry"].geojson if GEOJSON_INLINE else GEOJSON_URL,
         color=column,
         color_continuous_scale="Reds",
         featureidkey="properties.name",
         title=f"{new_region} {value:.1f}{unit} ({year})"
     )
 
-    if new_region != 'Austria':
-        selected_feature = next(
-            (f for f in geojson_data['features'] if f['properties']['name'] == new_region),
-            None
+    # precomputed bounding box over all of the region's polygons
+    bbox = datasets["geometry"].bbox(new_region) if new_region != 'Austria' else None
+    if bbox:
+        lon_min, lon_max, lat_min, lat_max = bbox
+        fig_map.update_geos(
+            lonaxis_range=[lon_min, lon_max],
+            lataxis_range=[lat_min, lat_max],
+            visible=False
         )
-        if selected_feature:
-            coords = selected_feature['geometry']['coordinates'][0][0]
-            lons, lats = zip(*coords)
-            fig_map.update_geos(
-                lonaxis_range=[min(lons), max(lons)],
-                lataxis_range=[min(lats), max(lats)],
-                visible=False
-            )
-    else:
+    elif new_region == 'Austria':
         fig_map.update_geos(fitbounds="locations", visible=False)
 
     fig_map.update_traces(
@@ -765,36 +1027,86 @@ def update_visuals(click_data, metric_value, stat_type, year, reset_clicks, curr
         selector=dict(type='choropleth')
     )
 
-    return fig, fig_map, new_region
+    return fig, fig_map
 
 
-@app.callback(
-    Output('data-insights', 'children'),
-    Input('metric-dropdown', 'value'),
-    Input('stat-type-radio', 'value'),
-    Input('year-dropdown', 'value')
-,
-)
-def update_insights(metric_dropdown_value, stat_type_value, year):
-    column = resolve_column(metric_dropdown_value, stat_type_value)
-    d_year = data[data['year'] == int(year)]
-
-    highest = d_year.loc[d_year[column].idxmax()]
-    lowest = d_year.loc[d_year[column].idxmin()]
+def year_window(year_range):
+    # x-axis range showing the slider's years, with room for the end markers
+    return [year_range[0] - 0.5, year_range[1] + 0.5]
 
-    label_map = {
-        'perc': '% of Population',
-        'avg_hours': 'Average Weekly Hours',
-        'median_hours': 'Median Weekly Hours'
-    }
 
-    return [
-        #html.H4(f"Year: {year}"),
-        html.H5(f"Highest: {highest['region']} ({highest[column]} {label_map[stat_type_value]})"),
-        html.H5(f"Lowest: {lowest['region']} ({lowest[column]} {label_map[stat_type_value]})")
-    ]
+# the time-series builders start from px.line(), whose empty trace comes before the lines
+FIRST_LINE_TRACE = 1
 
 
+def window_lines(name, args, year_range):
+    # values inside year_range of each line of a time-series figure, in trace order
+    trend_index = datasets["trend"]
+    if name == "time_series":
+        demographic, volunteer_type, show_type = args
+        column = f"{volunteer_type}_volunteer_{'perc' if show_type == 'perc' else 'count'}"
+        # the categories build_time_series draws a line for
+        drawn = [cat for cat in trend_index.categories.get(demographic, [])
+                 if len(trend_index.category_series(demographic, cat)['year']) and column in trend_index.columns]
+        return [trend_index.category_series(demographic, cat, year_range)[column] for cat in drawn]
+    demographic, category, display_mode = args
+    if demographic is None or category is None:
+        return []
+    suffix = f"_volunteer_{'perc' if display_mode == 'perc' else 'count'}"
+    series = trend_index.category_series(demographic, category, year_range)
+    return [series[f"{vol_type}{suffix}"] for vol_type in TREND_VOL_TYPES if f"{vol_type}{suffix}" in series]
+
+
+def window_y_range(lines):
+    # y-axis range fitting the values inside the window, None if there are none
+    values = np.concatenate(lines) if lines else np.empty(0)
+    if np.isnan(values).all():
+        return None
+    low, high = float(np.nanmin(values)), float(np.nanmax(values))
+    # 5% headroom, as autorange leaves room for the markers
+    pad = (high - low) * 0.05 or max(abs(high) * 0.05, 1.0)
+    return [round(low - pad, 4), round(high + pad, 4)]
+
+
+def has_values(values):
+    # a line with no point inside the window is hidden, legend entry included
+    return bool(len(values)) and not np.isnan(values).all()
+
+
+def with_year_window(figure, name, args, year_range):
+    # copy of a cached all-years figure zoomed to year_range; the cached dict is shared, so not modified
+    if not year_range:
+        return figure
+    lines = window_lines(name, args, year_range)
+    layout = dict(figure['layout'], xaxis=dict(figure['layout'].get('xaxis', {}), range=year_window(year_range)))
+    y_range = window_y_range(lines)
+    if y_range is not None:
+        layout['yaxis'] = dict(figure['layout'].get('yaxis', {}), range=y_range)
+    data = list(figure['data'])
+    if len(data) == FIRST_LINE_TRACE + len(lines):
+        for i, values in enumerate(lines, FIRST_LINE_TRACE):
+            if not has_values(values):
+                data[i] = dict(data[i], visible=False)
+    return dict(figure, data=data, layout=layout)
+
+
+def year_window_patch(name, args, year_range):
+    # the browser already has every year, a slider move only changes what is shown
+    lines = window_lines(name, args, year_range)
+    patched = Patch()
+    patched['layout']['xaxis']['range'] = year_window(year_range)
+    y_range = window_y_range(lines)
+    if y_range is not None:
+        patched['layout']['yaxis']['range'] = y_range
+    for i, values in enumerate(lines, FIRST_LINE_TRACE):
+        patched['data'][i]['visible'] = has_values(values)
+    return patched
+
+
+# The time-series figures hold every year and the year slider only zooms the x
+# and y axes and hides the lines with no data in the window: a slider move is
+# answered with a Patch, nothing is rebuilt, and the cached figures don't depend
+# on the range.
 @app.callback(
     Output("ts-line-graph", "figure"),
     Input("ts-demographic-dropdown", "value"),
@@ -802,28 +1114,42 @@ def update_insights(metric_dropdown_value, stat_type_value, year):
     Input("ts-radio", "value"),
     Input("ts-year-slider", "value"),
 )
+@callback_metrics.instrument("time_series")
 def update_time_series(demographic, volunteer_type, show_type, year_range):
-    d = trend_data[
-        (trend_data['demographic'] == demographic) &
-        (trend_data['year'] >= year_range[0]) &
-        (trend_data['year'] <= year_range[1])
+    args = (demographic, volunteer_type, show_type)
+    if ctx.triggered_id == "ts-year-slider":
+        return year_window_patch("time_series", args, year_range)
+    return with_year_window(build_time_series(*args), "time_series", args, year_range)
+
+
+@figure_cache.memoize("time_series")
+def build_time_series(demographic, volunteer_type, show_type):
+    if show_type == 'perc':
+        y_col = f"{volunteer_type}_volunteer_perc"
+        y_label = "Percentage of Volunteers"
+    else:
+        y_col = f"{volunteer_type}_volunteer_count"
+        y_label = "Number of Volunteers (thousands)"
+    trend_index = datasets["trend"]
+    # year-sorted arrays per category, slices of the index's arrays
+    subsets = [
+        (cat, trend_index.category_series(demographic, cat))
+        for cat in trend_index.categories.get(demographic, [])
     ]
-    categories = d['category'].unique()
-    fig = px.line()
-    for cat in categories:
-        subset = d[d['category'] == cat].sort_values('year')
-        if show_type == 'perc':
-            y_col = f"{volunteer_type}_volunteer_perc"
-            y_label = "Percentage of Volunteers"
-        else:
-            y_col = f"{volunteer_type}_volunteer_count"
-            y_label = "Number of Volunteers (thousands)"
-        fig.add_scatter(
+    callback_metrics.mark("select")
+    # one line per category so each keeps its legend entry, added in one call
+    traces = []
+    for cat, subset in subsets:
+        if not len(subset['year']) or y_col not in subset:
+            continue
+        traces.append(go.Scatter(
             x=subset['year'],
             y=subset[y_col],
             mode='lines+markers',
             name=cat
-        )
+        ))
+    fig = px.line()
+    fig.add_traces(traces)
     fig.update_layout(
         title="Trends in Volunteering by Demographic",
         xaxis_title="Year",
@@ -833,25 +1159,25 @@ def update_time_series(demographic, volunteer_type, show_type, year_range):
         height=450,
         template="plotly_white"
     )
+    callback_metrics.mark("figure")
     return fig
 
 
-@app.callback(
+@lookup_callback(
     Output("mb-diverging-bar", "figure"),
     Input("mb-type-radio", "value"),
     Input("mb-gender-dropdown", "value"),
     Input("mb-year-dropdown", "value")
 )
+@callback_metrics.instrument("motiv_barrier")
+@figure_cache.memoize("motiv_barrier")
 def update_motiv_barrier_chart(type_choice, gender_choice, selected_year):
-    df = motiv_barrier_df[
-        (motiv_barrier_df['type'] == type_choice) &
-        (motiv_barrier_df['gender'] == gender_choice) &
-        (motiv_barrier_df['year'] == selected_year)
-    ].sort_values("fully_agree", ascending=True)
+    # already sorted by 'fully_agree'
+    df = datasets["motiv_barrier"].get(type_choice, gender_choice, selected_year)
+    callback_metrics.mark("select")
 
     categories = df['category']
 
-    import plotly.graph_objects as go
     fig = go.Figure()
 
     fig.add_bar(
@@ -899,41 +1225,45 @@ def update_motiv_barrier_chart(type_choice, gender_choice, selected_year):
         height=600,
         template='plotly_white'
     )
+    callback_metrics.mark("figure")
 
     return fig
 
 
-@app.callback(
+@lookup_callback(
     Output("activity-stacked-bar", "figure"),
     Input("activity-type-dropdown", "value"),
     Input("activity-demographic-dropdown", "value"),
     Input("activity-display-mode", "value"),
     Input("activity-year-dropdown", "value")
 )
+@callback_metrics.instrument("activity_stacked_bar")
+@figure_cache.memoize("activity_stacked_bar")
 def update_activity_stacked_bar(vol_type, selected_demo, display_mode,selected_year):
 
 
 
     # Choose dataset
 
-    data_by_year = formal_data_by_year if vol_type == "formal" else informal_data_by_year
-    year_str = str(selected_year)
+    facts = datasets["facts"]
+    vol_type_key = "formal" if vol_type == "formal" else "informal"
 
-    if year_str in data_by_year:
-        data_source = data_by_year[year_str]
-    else:
+    if not facts.has_year("activity", selected_year, vol_type_key):
         # Fallback to empty data if year missing
         return px.bar(title="No data available for selected year")
 
-    if selected_demo not in data_source:
+    counts = facts.query("activity", "count", selected_year, vol_type_key, selected_demo)
+    if counts.empty:
         return px.bar(title="No data available for selected demographic")
-
-    df = pd.DataFrame(data_source[selected_demo])
-
+    df = pd.DataFrame({
+        "name": counts["category"].to_numpy(),
+        "category": counts["group"].to_numpy(),
+        "count": counts["value"].to_numpy(),
+    })
 
     # Extract total volunteers from "Total"
-    total_list = data_source["Total"]
-    all_volunteers = next((item["all_volunteers"] for item in total_list if "all_volunteers" in item), None)
+    total = facts.query("activity", "all_volunteers", selected_year, vol_type_key, "Total")
+    all_volunteers = total["value"].iloc[0] if len(total) else None
 
     # Calculate display value
     if display_mode == "percent" and all_volunteers:
@@ -942,6 +1272,7 @@ def update_activity_stacked_bar(vol_type, selected_demo, display_mode,selected_y
     else:
         df["value"] = df["count"]
         y_axis_title = "Number of Volunteers (thousands)"
+    callback_metrics.mark("select")
 
     # Plot
     if selected_demo == "Total":
@@ -970,70 +1301,39 @@ def update_activity_stacked_bar(vol_type, selected_demo, display_mode,selected_y
         template="plotly_white",
         height=500
     )
+    callback_metrics.mark("figure")
     return fig
 
 
-@app.callback(
+@lookup_callback(
     Output("gender-comparison-bar", "figure"),
     Input("gender-type-dropdown", "value"),
     Input("gender-dimension-dropdown", "value"),
     Input("gender-display-mode", "value"),
     Input("gender-year-dropdown", "value")
 )
+@callback_metrics.instrument("gender_comparison")
+@figure_cache.memoize("gender_comparison")
 def update_gender_comparison(vol_type, dimension, display_mode, selected_year):
-    import plotly.express as px
-    import pandas as pd
-
-    # Load data for the chosen year
-    year_data = gender_data_by_year.get(str(selected_year), {})
+    # Facts for the chosen year, dimension and measure
+    measure = "count" if display_mode == "count" else "perc"
+    rows = datasets["facts"].query("gender", measure, selected_year, vol_type, dimension)
 
-    # Compose key for this dimension
-    key = f"{vol_type}_{dimension}"
-    section = year_data.get(key)
-
-    if section is None:
+    if rows.empty:
         return px.bar(title="No data for selected filters.")
 
-    df = pd.DataFrame(section)
-
-    # Determine x-axis label based on dimension
-    if dimension == "NumberOfOrgs":
-        x_col = "num_orgs"
-    elif dimension == "TaskTypes":
-        x_col = "task"
-    elif dimension == "Areas":
-        x_col = "area"
-    elif dimension == "Time/week":
-        x_col = "hours_range/week"
-    else:
-        x_col = "category"
-
+    # axis named after the asset column the categories come from
+    x_col = datasets["facts"].label("gender", dimension)
+    df_long = pd.DataFrame({
+        x_col: rows["category"].to_numpy(),
+        "Gender": rows["group"].to_numpy(),
+        "Value": rows["value"].to_numpy(),
+    })
     if display_mode == "count":
-        df_long = pd.melt(
-            df,
-            id_vars=[x_col],
-            value_vars=["men_count", "women_count"],
-            var_name="Gender",
-            value_name="Value"
-        )
         y_label = "Number of Volunteers (thousands)"
     else:
-        df_long = pd.melt(
-            df,
-            id_vars=[x_col],
-            value_vars=["men_perc", "women_perc"],
-            var_name="Gender",
-            value_name="Value"
-        )
         y_label = "Percentage of Volunteers (%)"
-
-    # Map gender names
-    df_long["Gender"] = df_long["Gender"].replace({
-        "men_count": "Men",
-        "women_count": "Women",
-        "men_perc": "Men",
-        "women_perc": "Women"
-    })
+    callback_metrics.mark("select")
 
     # Plot grouped bar
     fig = px.bar(
@@ -1055,14 +1355,16 @@ def update_gender_comparison(vol_type, dimension, display_mode, selected_year):
         template="plotly_white",
         height=500
     )
+    callback_metrics.mark("figure")
 
     return fig
 
-@app.callback(
+@lookup_callback(
     Output("gender-dimension-dropdown", "options"),
     Output("gender-dimension-dropdown", "value"),
     Input("gender-type-dropdown", "value")
 )
+@callback_metrics.instrument("dimension_options")
 def update_dimension_options(vol_type):
     if vol_type == "Formal":
         options = [
@@ -1080,79 +1382,75 @@ def update_dimension_options(vol_type):
         default_value = "Areas"
     return options, default_value
 
-@app.callback(
+@lookup_callback(
     Output("errorBar-figure", "figure"),
     Input("errorBar-voltype-dropdown", "value"),
     Input("errorBar-demographic-dropdown", "value"),
     Input("errorBar-year-dropdown", "value"),
 )
+@callback_metrics.instrument("errorBar")
+@figure_cache.memoize("errorBar")
 def update_errorBar(vol_type, demographic, selected_year):
-    import plotly.graph_objects as go
-    import plotly.colors as pc
-
-    # Retrieve year data
-    year_data = errorBars_data_by_year.get(str(selected_year), {})
-    category_data = year_data.get(demographic, [])
-
-    # Filter by volunteering type
-    df = pd.DataFrame([
-        d for d in category_data
-        if d["volunteering_type"] == vol_type
-    ])
+    # One row per category for this year, demographic and volunteering type
+    df = datasets["facts"].wide("error_bars", selected_year, vol_type, demographic,
+                                ["persons_1000", "avg_hours", "percentile_25", "percentile_50", "percentile_75"])
 
-    if df.empty:
+    if df is None or df.empty:
         return go.Figure().update_layout(
             title=f"No data for selection in {selected_year}"
         )
+    callback_metrics.mark("select")
 
-    # Prepare color palette
+    # One color per category, cycling through the palette
     color_list = pc.qualitative.Plotly
-    colors = color_list * (len(df) // len(color_list) + 1)
+    colors = [color_list[i % len(color_list)] for i in range(len(df))]
+
+    categories = df["category"]
+    median = df["percentile_50"]
 
     fig = go.Figure()
 
-    for i, (_, row) in enumerate(df.iterrows()):
-        # Add bar for median with IQR as error bars
-        fig.add_trace(go.Bar(
-            x=[row["category_value"]],
-            y=[row["percentile_50"]],
-            error_y=dict(
-                type="data",
-                symmetric=False,
-                array=[row["percentile_75"] - row["percentile_50"]],
-                arrayminus=[row["percentile_50"] - row["percentile_25"]],
-                thickness=2,
-                width=8,
-                color="rgba(0,0,0,0.5)"
-            ),
-            name=row["category_value"],
-            marker_color=colors[i],
-            hovertemplate=(
-                f"<b>{row['category_value']}</b><br>"
-                f"Q3 (75th %): {row['percentile_75']}<br>"
-                f"Median (50th %): {row['percentile_50']}<br>"
-                f"Q1 (25th %): {row['percentile_25']}<br>"
-                
-            )
-        ))
+    # Medians as one bar trace, IQR as per-bar error bars
+    fig.add_trace(go.Bar(
+        x=categories,
+        y=median,
+        error_y=dict(
+            type="data",
+            symmetric=False,
+            array=df["percentile_75"] - median,
+            arrayminus=median - df["percentile_25"],
+            thickness=2,
+            width=8,
+            color="rgba(0,0,0,0.5)"
+        ),
+        name="Median (IQR)",
+        marker_color=colors,
+        customdata=df[["percentile_75", "percentile_50", "percentile_25"]],
+        hovertemplate=(
+            "<b>%{x}</b><br>"
+            "Q3 (75th %): %{customdata[0]}<br>"
+            "Median (50th %): %{customdata[1]}<br>"
+            "Q1 (25th %): %{customdata[2]}<extra></extra>"
+        )
+    ))
 
-        # Add mean as a scatter point overlaying the bar
-        fig.add_trace(go.Scatter(
-            x=[row["category_value"]],
-            y=[row["avg_hours"]],
-            mode="markers",
-            marker=dict(
-                color="black",
-                size=10,
-                symbol="diamond"
-            ),
-            name=f"Mean ({row['category_value']})",
-            hovertemplate=(
-                f"<b>{row['category_value']}</b><br>"
-                f"Mean: {row['avg_hours']}<extra></extra>"
-            ),
-            showlegend=True
-        ))
+    # Means as one marker trace overlaying the bars
+    fig.add_trace(go.Scatter(
+        x=categories,
+        y=df["avg_hours"],
+        mode="markers",
+        marker=dict(
+            color="black",
+            size=10,
+            symbol="diamond"
+        ),
+        name="Mean",
+        hovertemplate=(
+            "<b>%{x}</b><br>"
+            "Mean: %{y}<extra></extra>"
+        ),
+        showlegend=True
+    ))
 
     fig.update_layout(
         title=f"Volunteer Hours per Week – {vol_type} – {demographic} ({selected_year})",
@@ -1170,20 +1468,21 @@ def update_errorBar(vol_type, demographic, selected_year):
             title="Legend"
         )
     )
+    callback_metrics.mark("figure")
 
     return fig
 
-@app.callback(
+@lookup_callback(
     Output("ts2-category-dropdown", "options"),
     Output("ts2-category-dropdown", "value"),
     Input("ts2-demographic-dropdown", "value")
 )
+@callback_metrics.instrument("ts2_categories")
 def update_ts2_categories(demographic):
     if demographic is None:
         return [], None
 
-    filtered = trend_data[trend_data["demographic"] == demographic]
-    unique_categories = sorted(filtered["category"].unique())
+    unique_categories = datasets["trend"].sorted_categories(demographic)
 
     options = [
         {"label": cat, "value": cat} for cat in unique_categories
@@ -1201,47 +1500,45 @@ def update_ts2_categories(demographic):
     Input("ts2-radio", "value"),
     Input("ts2-year-slider", "value")
 )
+@callback_metrics.instrument("ts2_graph")
 def update_ts2_graph(demographic, category, display_mode, year_range):
-    import plotly.express as px
+    args = (demographic, category, display_mode)
+    if ctx.triggered_id == "ts2-year-slider":
+        return year_window_patch("ts2_graph", args, year_range)
+    return with_year_window(build_ts2_graph(*args), "ts2_graph", args, year_range)
+
 
+@figure_cache.memoize("ts2_graph")
+def build_ts2_graph(demographic, category, display_mode):
     if demographic is None or category is None:
         return px.line(title="No data available.")
 
-    # Filter the trend data
-    df_filtered = trend_data[
-        (trend_data["demographic"] == demographic) &
-        (trend_data["category"] == category) &
-        (trend_data["year"] >= year_range[0]) &
-        (trend_data["year"] <= year_range[1])
-    ]
+    # Year-sorted series for this category, views of the index's arrays
+    df_filtered = datasets["trend"].category_series(demographic, category)
+    callback_metrics.mark("select")
 
-    # Volunteering types to compare
-    vol_types = [
-        "any",
-        "formal",
-        "informal",
-        "both_formal_and_informal",
-        "formal_only",
-        "informal_only"
+    if display_mode == "perc":
+        suffix = "perc"
+        y_label = "Percentage of Volunteers"
+    else:
+        suffix = "count"
+        y_label = "Number of Volunteers (thousands)"
+
+    # every type is an array of the same year-sorted series, so the lines share one x array
+    years = df_filtered["year"]
+    traces = [
+        go.Scatter(
+            x=years,
+            y=df_filtered[f"{vol_type}_volunteer_{suffix}"],
+            mode='lines+markers',
+            name=vol_type.replace("_", " ").capitalize()
+        )
+        for vol_type in TREND_VOL_TYPES
+        if f"{vol_type}_volunteer_{suffix}" in df_filtered
     ]
 
     fig = px.line()
-
-    for vol_type in vol_types:
-        if display_mode == "perc":
-            y_col = f"{vol_type}_volunteer_perc"
-            y_label = "Percentage of Volunteers"
-        else:
-            y_col = f"{vol_type}_volunteer_count"
-            y_label = "Number of Volunteers (thousands)"
-
-        if y_col in df_filtered.columns:
-            fig.add_scatter(
-                x=df_filtered["year"],
-                y=df_filtered[y_col],
-                mode='lines+markers',
-                name=vol_type.replace("_", " ").capitalize()
-            )
+    fig.add_traces(traces)
 
     fig.update_layout(
         title=f"Volunteering Type Comparison – {category} ({demographic.capitalize()})",
@@ -1251,10 +1548,113 @@ def update_ts2_graph(demographic, category, display_mode, year_range):
         height=500,
         template="plotly_white"
     )
+    callback_metrics.mark("figure")
 
     return fig
 
 
+def figure_input_grid():
+    # Every valid argument tuple of the memoized figure builders, used to pre-render bundles
+    geo_index = datasets["geo"]
+    trend_index = datasets["trend"]
+    return {
+        "region_figures": [
+            (region, metric, stat, year)
+            for year in years
+            for region in geo_index.year(year)['region']
+            for metric in ['perc_volunteers_from_pop', 'perc_formal_from_pop', 'perc_informal_from_pop']
+            for stat in ['perc', 'avg_hours', 'median_hours']
+        ],
+        "time_series": [
+            (demographic, vol_type, stat)
+            for demographic in trend_index.demographics
+            for vol_type in TREND_VOL_TYPES
+            for stat in ['perc', 'count']
+        ],
+        "ts2_graph": [
+            (demographic, category, stat)
+            for demographic in trend_index.demographics
+            for category in trend_index.sorted_categories(demographic)
+            for stat in ['perc', 'count']
+        ],
+        "motiv_barrier": [
+            (type_, gender, year)
+            for type_ in ['motivation', 'barrier']
+            for gender in datasets["motiv_barrier"].genders
+            for year in years
+        ],
+        "activity_stacked_bar": [
+            (vol_type, demographic, mode, year)
+            for vol_type in ['formal', 'informal']
+            for demographic in ['Total', 'Gender', 'Education', 'Freq_of_volunteering', 'Age']
+            for mode in ['percent', 'count']
+            for year in years
+        ],
+        "gender_comparison": [
+            (vol_type, option['value'], mode, year)
+            for vol_type in ['Formal', 'Informal']
+            for option in update_dimension_options(vol_type)[0]
+            for mode in ['percent', 'count']
+            for year in years
+        ],
+        "errorBar": [
+            (vol_type, demographic, year)
+            for vol_type in ['Total', 'Formal', 'Informal']
+            for demographic in ['Total', 'Gender', 'Age', 'Education', 'MigrationBackground',
+                                'Employment', 'MunicipalitySize', 'Region', 'TaskType']
+            for year in years
+        ],
+    }
+
+
+if CLIENTSIDE_CALLBACKS:
+    clientside.register(app, {
+        "gender-type-dropdown": "gender-dimension-dropdown",
+        "ts2-demographic-dropdown": "ts2-category-dropdown",
+    })
+    # lookup data for the browser: built in the master with preload, otherwise in a
+    # background thread from a worker's first request, never by a page request
+    datasets.register("clientside_lookups", lambda: clientside.build_lookups(
+        figure_cache,
+        figure_input_grid(),
+        {
+            "gender-dimension-dropdown": clientside.options_store_data(
+                update_dimension_options, ["Formal", "Informal"]),
+            "ts2-category-dropdown": clientside.options_store_data(
+                update_ts2_categories, datasets["trend"].demographics),
+        },
+    ))
+
+    @server.before_request
+    def build_clientside_lookups():
+        # threads don't survive a fork, so it is started per worker; a no-op once loaded
+        if not datasets.dataset("clientside_lookups").loaded:
+            datasets.load_in_background("clientside_lookups")
+
+    @server.route(clientside.LOOKUPS_PATH)
+    def clientside_lookups():
+        # fetched once per page load; revalidated each time, so a reload reaches new pages
+        lookups = datasets["clientside_lookups"]
+        response = Response(lookups.json_bytes, mimetype="application/json")
+        response.set_etag(lookups.etag)
+        response.cache_control.no_cache = True
+        return response.make_conditional(request)
+
+
+# Assigned last: Dash builds the layout once right away to validate it
+app.layout = serve_layout
+
+
+def create_server(preload=False):
+    # WSGI factory for gunicorn.conf.py. With preload the master process loads every
+    # dataset before forking; gc.freeze() keeps the collector from writing to those
+    # objects in the workers, so their pages stay shared (post_fork re-enables gc).
+    if preload:
+        gc.disable()
+        datasets.load_all()
+        gc.freeze()
+    return server
+
 
 if __name__ == "__main__":
     port = int(os.environ.get("PORT", 8080))
@@ -0,0 +1,57 @@
+// Clientside callbacks used when the app runs with CLIENTSIDE_CALLBACKS=1 (see clientside.py)
+(function () {
+    // lookups URL -> Promise of the parsed document, fetched once per page load
+    var lookups = {};
+
+    function loadLookups(url) {
+        if (!lookups[url]) {
+            lookups[url] = fetch(url, {credentials: "same-origin"}).then(function (response) {
+                if (!response.ok) {
+                    throw new Error("loading " + url + " failed: " + response.status);
+                }
+                return response.json();
+            }).catch(function (error) {
+                delete lookups[url];  // the next callback tries again
+                throw error;
+            });
+        }
+        return lookups[url];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        volunteer: {
+            toggle_offcanvas: function (n, isOpen) {
+                return n ? !isOpen : isOpen;
+            },
+
+            // lookups.options[target]: {value: {options: [...], value: default}}
+            options_lookup: function (value, target, url) {
+                return loadLookups(url).then(function (data) {
+                    var store = data.options[target];
+                    var entry = store && store[value];
+                    if (!entry) {
+                        return [[], null];
+                    }
+                    return [entry.options, entry.value];
+                });
+            },
+
+            // arguments: the card's input values, its graph id and the lookups URL
+            figure_lookup: function () {
+                var args = Array.prototype.slice.call(arguments);
+                var url = args.pop();
+                var graph = args.pop();
+                return loadLookups(url).then(function (data) {
+                    var store = data.figures[graph];
+                    var entry = store && store.figures[JSON.stringify(args)];
+                    if (!entry) {
+                        return {data: [], layout: {title: {text: "No data for selected filters."}}};
+                    }
+                    var figure = entry[1];
+                    var layout = Object.assign({}, figure.layout, {template: store.templates[entry[0]]});
+                    return Object.assign({}, figure, {layout: layout});
+                });
+            }
+        }
+    });
+})();
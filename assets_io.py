@@ -0,0 +1,207 @@
+"""Reading the dashboard datasets, preferring typed columnar copies over JSON.
+
+    python assets_io.py convert [--format parquet|feather]
+
+writes a columnar copy of each JSON asset (needs pyarrow); load_table() reads
+it while it is at least as new as the JSON. Every asset is cast to its schema
+(SCHEMAS): categorical dimensions, int16 years, int32 counts, float64
+measures. A column that is missing or doesn't fit raises SchemaError at load
+time. Nested {year: {section: [records]}} assets come back as one long table
+with 'year' and 'section' columns.
+"""
+import argparse
+import json
+import os
+
+from lazy_imports import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+DATA_DIR = os.environ.get("DATA_DIR", "assets")
+
+# dataset name -> (JSON file stem, nested {year: {section: [records]}} layout)
+ASSETS = {
+    "geo": ("Geo_interpolated_by_year", False),
+    "trend": ("volunteering_time_series_fake", False),
+    "motiv_barrier": ("motivations_barriers_fake_data", False),
+    "activity_formal": ("formal_volunteering_fake_data", True),
+    "activity_informal": ("informal_volunteering_fake_data", True),
+    "gender": ("gender_comparison_data_multiyear", True),
+    "error_bars": ("errorBars_data_multiyear", True),
+}
+
+# column kinds: dtype, whether the column must exist, whether it may have missing values
+KINDS = {
+    "year": ("int16", True, False),
+    "dimension": ("category", True, False),
+    "label": ("category", False, True),      # names only some sections of a nested asset carry
+    "measure": ("float64", True, True),
+    "sparse": ("float64", False, True),      # values only some sections of a nested asset carry
+    "count": ("int32", True, False),
+}
+
+GEO_MEASURES = [
+    f"{stat}_{base}"
+    for base in ("vlntrs", "formal", "informal")
+    for stat in ("avg_hours", "25_hrs", "median_hours", "75_hrs")
+] + ["perc_volunteers_from_pop", "perc_formal_from_pop", "perc_informal_from_pop", "total_volunteers"]
+TREND_MEASURES = ["population"] + [
+    f"{vol_type}_volunteer_{stat}"
+    for vol_type in ("any", "formal", "informal", "both_formal_and_informal", "formal_only", "informal_only")
+    for stat in ("count", "perc")
+]
+
+# measures are rounded to this many decimals when loaded
+MEASURE_DECIMALS = 6
+
+# dataset name -> {column: kind}
+SCHEMAS = {
+    "geo": dict({"year": "year", "region": "dimension", "total_pop": "count"},
+                **{column: "measure" for column in GEO_MEASURES}),
+    "trend": dict({"year": "year", "demographic": "dimension", "category": "dimension"},
+                  **{column: "measure" for column in TREND_MEASURES}),
+    "motiv_barrier": dict({"year": "year", "type": "dimension", "gender": "dimension", "category": "dimension"},
+                          **{column: "measure" for column in
+                             ("population", "fully_agree", "rather_agree", "rather_disagree", "not_at_all")}),
+    "activity_formal": {"year": "year", "section": "dimension", "all_volunteers": "sparse", "id": "sparse",
+                        "name": "label", "count": "sparse", "category": "label"},
+    "gender": dict({"year": "year", "section": "dimension"},
+                   **{column: "label" for column in ("num_orgs", "task", "area", "hours_range/week")},
+                   **{column: "measure" for column in ("men_count", "men_perc", "women_count", "women_perc")}),
+    "error_bars": dict({"year": "year", "section": "dimension", "category_value": "dimension",
+                        "volunteering_type": "dimension"},
+                       **{column: "measure" for column in
+                          ("persons_1000", "avg_hours", "percentile_25", "percentile_50", "percentile_75")}),
+}
+SCHEMAS["activity_informal"] = SCHEMAS["activity_formal"]
+
+
+class SchemaError(ValueError):
+    pass
+
+
+# extension -> (reader, writer)
+FORMATS = {
+    ".parquet": (lambda path: pd.read_parquet(path), lambda frame, path: frame.to_parquet(path, index=False)),
+    ".feather": (lambda path: pd.read_feather(path), lambda frame, path: frame.to_feather(path)),
+}
+
+
+def asset_path(name, extension=".json", folder=None):
+    return os.path.join(folder or DATA_DIR, ASSETS[name][0] + extension)
+
+
+def asset_files(*names, folder=None):
+    # every file load_table() may read for these assets, for change detection
+    return [asset_path(name, extension, folder) for name in names for extension in (".json",) + tuple(FORMATS)]
+
+
+def flatten_nested(nested):
+    # {year: {section: [records]}} -> one row per record plus 'year' and 'section'
+    rows = [
+        dict(record, year=int(year), section=section)
+        for year, sections in nested.items()
+        for section, records in sections.items()
+        for record in records
+    ]
+    frame = pd.DataFrame(rows)
+    columns = ["year", "section"] + [c for c in frame.columns if c not in ("year", "section")]
+    return frame[columns]
+
+
+def read_json_asset(name, folder=None):
+    path = asset_path(name, folder=folder)
+    if not ASSETS[name][1]:
+        return pd.read_json(path)
+    with open(path, "r", encoding="utf-8") as f:
+        return flatten_nested(json.load(f))
+
+
+def source_file(name, folder=None):
+    # the file load_table() reads for this asset
+    source = columnar_source(name, folder)
+    return source[0] if source is not None else asset_path(name, folder=folder)
+
+
+def columnar_source(name, folder=None):
+    # (path, extension) of the first format in FORMATS order whose copy is at least as new as
+    # the JSON, or None when only the JSON is current
+    json_path = asset_path(name, folder=folder)
+    json_mtime = os.path.getmtime(json_path) if os.path.exists(json_path) else 0
+    for extension in FORMATS:
+        path = asset_path(name, extension, folder)
+        if os.path.exists(path) and os.path.getmtime(path) >= json_mtime:
+            return path, extension
+    return None
+
+
+def to_columnar(frame):
+    # strings become dictionary-encoded categoricals
+    frame = frame.copy()
+    for column in frame.columns:
+        if frame[column].dtype == object or pd.api.types.is_string_dtype(frame[column]):
+            frame[column] = frame[column].astype("category")
+    return frame
+
+
+def apply_schema(name, frame):
+    # casts the declared columns of dataset `name`, raises SchemaError when one doesn't fit
+    frame = frame.copy()
+    for column, kind in SCHEMAS[name].items():
+        dtype, required, nullable = KINDS[kind]
+        if column not in frame.columns:
+            if required:
+                raise SchemaError(f"{name}: missing column {column!r}")
+            continue
+        values = frame[column]
+        if not nullable and values.isna().any():
+            raise SchemaError(f"{name}: column {column!r} has {int(values.isna().sum())} missing values")
+        if dtype == "category":
+            frame[column] = values if isinstance(values.dtype, pd.CategoricalDtype) else values.astype("category")
+            continue
+        try:
+            numbers = pd.to_numeric(values, errors="raise")
+        except (TypeError, ValueError) as err:
+            raise SchemaError(f"{name}: column {column!r} is not numeric ({err})") from None
+        if dtype.startswith("int"):
+            info = np.iinfo(dtype)
+            if (numbers % 1 != 0).any() or numbers.min() < info.min or numbers.max() > info.max:
+                raise SchemaError(f"{name}: column {column!r} doesn't fit {dtype}")
+        numbers = numbers.astype(dtype)
+        if dtype.startswith("float"):
+            # drops float noise such as 4.8100000000000005 from interpolated extracts, which
+            # would otherwise show in hover text
+            numbers = numbers.round(MEASURE_DECIMALS)
+        frame[column] = numbers
+    return frame
+
+
+def load_table(name, folder=None):
+    source = columnar_source(name, folder)
+    if source is not None:
+        path, extension = source
+        try:
+            return apply_schema(name, to_columnar(FORMATS[extension][0](path)))
+        except ImportError:
+            pass  # pyarrow missing in this environment
+    return apply_schema(name, to_columnar(read_json_asset(name, folder)))
+
+
+def convert(extension=".parquet", folder=None):
+    writer = FORMATS[extension][1]
+    for name in ASSETS:
+        frame = apply_schema(name, to_columnar(read_json_asset(name, folder)))
+        path = asset_path(name, extension, folder)
+        writer(frame, path)
+        print(f"{asset_path(name, folder=folder)} -> {path} ({len(frame)} rows)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    convert_parser = sub.add_parser("convert", help="write a columnar copy of every JSON asset")
+    convert_parser.add_argument("--format", choices=["parquet", "feather"], default="parquet")
+    convert_parser.add_argument("--folder", default=None, help=f"asset folder (default {DATA_DIR})")
+    args = parser.parse_args()
+    convert("." + args.format, args.folder)
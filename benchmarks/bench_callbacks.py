@@ -0,0 +1,250 @@
+"""Benchmark every dashboard callback over its full input grid.
+
+    python benchmarks/bench_callbacks.py [--e2e] [--save-baseline FILE] [--baseline FILE]
+
+Direct mode calls the undecorated builders; --e2e POSTs every input
+combination to /_dash-update-component through the Flask test client, with
+time-series slider moves answered as Patches. Reports p50/p95/p99 latency,
+JSON size and tracemalloc peak per callback; with --baseline it exits 1 on a
+regression beyond --threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)  # asset paths are relative to the repository root
+os.environ.setdefault("FIGURE_CACHE_MAX_BYTES", "0")
+os.environ.pop("FIGURE_BUNDLE", None)
+os.environ["CLIENTSIDE_CALLBACKS"] = "0"  # the lookup callbacks must run on the server
+
+import dash  # noqa: E402
+import plotly  # noqa: E402
+from plotly.io.json import to_json_plotly  # noqa: E402
+
+import app  # noqa: E402
+
+# callback name -> id of one of its outputs, to find it in /_dash-dependencies
+OUTPUT_IDS = {
+    "visuals": "region-boxplot",
+    "insights": "data-insights",
+    "time_series": "ts-line-graph",
+    "ts2_graph": "ts2-line-graph",
+    "motiv_barrier": "mb-diverging-bar",
+    "activity_stacked_bar": "activity-stacked-bar",
+    "gender_comparison": "gender-comparison-bar",
+    "errorBar": "errorBar-figure",
+}
+
+
+def year_ranges(trend_years):
+    # every [start, end] the range sliders can select (they snap to the marks)
+    return [[start, end] for i, start in enumerate(trend_years) for end in trend_years[i:]]
+
+
+def input_grids():
+    # callback name -> argument tuples, in the order of the callback's Inputs
+    grids = app.figure_input_grid()
+    ranges = year_ranges(list(app.datasets["trend"].years))
+    return {
+        "visuals": grids["region_figures"],
+        "insights": sorted({(metric, stat, year) for _, metric, stat, year in grids["region_figures"]}),
+        "time_series": [args + (r,) for args in grids["time_series"] for r in ranges],
+        "ts2_graph": [args + (r,) for args in grids["ts2_graph"] for r in ranges],
+        "motiv_barrier": grids["motiv_barrier"],
+        "activity_stacked_bar": grids["activity_stacked_bar"],
+        "gender_comparison": grids["gender_comparison"],
+        "errorBar": grids["errorBar"],
+    }
+
+
+def sample(grid, limit):
+    # evenly spaced subset, deterministic
+    if not limit or len(grid) <= limit:
+        return grid
+    step = len(grid) / limit
+    return [grid[int(i * step)] for i in range(limit)]
+
+
+def direct_runner(name):
+    if name == "visuals":
+        func = app.figure_cache.functions["region_figures"]
+    elif name == "insights":
+        func = app.build_insights
+    else:
+        func = app.figure_cache.functions[name]
+
+    def run(args):
+        if name in ("time_series", "ts2_graph"):
+            # the builder draws every year, the callback zooms it to the slider range
+            figure = app.with_year_window(app.figure_cache.prepare(func(*args[:-1])), name, args[:-1], args[-1])
+            return len(to_json_plotly(figure))
+        return len(to_json_plotly(app.figure_cache.prepare(func(*args))))
+    return run
+
+
+def e2e_runner(name, client, dependencies):
+    dependency = next(d for d in dependencies if f"{OUTPUT_IDS[name]}." in d["output"])
+    output = dependency["output"]
+    if output.startswith(".."):
+        outputs = [dict(zip(("id", "property"), o.rsplit(".", 1))) for o in output.strip(".").split("...")]
+    else:
+        outputs = dict(zip(("id", "property"), output.rsplit(".", 1)))
+    trend_years = app.datasets["trend"].years
+    full_range = [trend_years[0], trend_years[-1]]
+
+    def values(args):
+        # (input values, state values, index of the input that changed) for one argument tuple
+        if name == "visuals":
+            region, metric, stat, year = args
+            # a metric change with the region already selected
+            return [None, metric, stat, year, None], [region], 1
+        if name == "insights":
+            # the same callback, with no region selected yet
+            metric, stat, year = args
+            return [None, metric, stat, year, None], [None], 1
+        if name in ("time_series", "ts2_graph"):
+            # the full range arrives with a demographic change and builds the figure,
+            # every other range is a slider move
+            changed = 0 if list(args[-1]) == full_range else len(args) - 1
+            return list(args), [None] * len(dependency["state"]), changed
+        return list(args), [None] * len(dependency["state"]), 0
+
+    def run(args):
+        input_values, state_values, changed = values(args)
+        changed = dependency["inputs"][changed]
+        payload = {
+            "output": output,
+            "outputs": outputs,
+            "inputs": [dict(i, value=v) for i, v in zip(dependency["inputs"], input_values)],
+            "state": [dict(s, value=v) for s, v in zip(dependency["state"], state_values)],
+            "changedPropIds": [f"{changed['id']}.{changed['property']}"],
+        }
+        response = client.post("/_dash-update-component", json=payload)
+        if response.status_code not in (200, 204):
+            raise RuntimeError(f"{name}{args}: HTTP {response.status_code}")
+        return len(response.get_data())
+    return run
+
+
+def measure(run, grid, repeat, memory):
+    run(grid[0])  # warm-up: lazy imports, first-call setup
+    timings = []
+    sizes = []
+    for _ in range(repeat):
+        for args in grid:
+            started = time.perf_counter()
+            size = run(args)
+            timings.append(time.perf_counter() - started)
+            sizes.append(size)
+    result = {
+        "calls": len(timings),
+        "p50_ms": float(np.percentile(timings, 50) * 1000),
+        "p95_ms": float(np.percentile(timings, 95) * 1000),
+        "p99_ms": float(np.percentile(timings, 99) * 1000),
+        "bytes_mean": float(np.mean(sizes)),
+        "bytes_max": int(np.max(sizes)),
+        "peak_kib": None,
+    }
+    if memory:
+        # separate pass, tracemalloc slows every allocation down
+        peak = 0
+        tracemalloc.start()
+        for args in grid:
+            tracemalloc.reset_peak()
+            run(args)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+        result["peak_kib"] = peak / 1024
+    return result
+
+
+def compare(results, baseline, threshold):
+    # prints ratios against the baseline, returns the names that regressed
+    regressed = []
+    print(f"\n{'callback':<22}{'p50 ratio':>10}{'p95 ratio':>10}{'bytes ratio':>12}")
+    for name, current in results.items():
+        before = baseline["results"].get(name)
+        if before is None:
+            print(f"{name:<22}{'(new)':>10}")
+            continue
+        p50 = current["p50_ms"] / before["p50_ms"] if before["p50_ms"] else float("inf")
+        p95 = current["p95_ms"] / before["p95_ms"] if before["p95_ms"] else float("inf")
+        size = current["bytes_mean"] / before["bytes_mean"] if before["bytes_mean"] else float("inf")
+        flag = ""
+        if p50 > threshold or size > threshold:
+            flag = "  REGRESSION"
+            regressed.append(name)
+        print(f"{name:<22}{p50:>10.2f}{p95:>10.2f}{size:>12.2f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--e2e", action="store_true", help="POST through /_dash-update-component")
+    parser.add_argument("--only", nargs="*", choices=sorted(OUTPUT_IDS), help="callbacks to run")
+    parser.add_argument("--repeat", type=int, default=1, help="passes over each grid")
+    parser.add_argument("--limit", type=int, default=0, help="at most this many input combinations per callback")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--save-baseline", metavar="FILE", help="write the results as a baseline")
+    parser.add_argument("--baseline", metavar="FILE", help="compare against a saved baseline")
+    parser.add_argument("--threshold", type=float, default=1.25, help="ratio that counts as a regression")
+    args = parser.parse_args()
+
+    mode = "e2e" if args.e2e else "direct"
+    started = time.perf_counter()
+    app.datasets.load_all()
+    print(f"datasets loaded in {time.perf_counter() - started:.2f}s, mode {mode}")
+
+    if args.e2e:
+        client = app.server.test_client()
+        dependencies = client.get("/_dash-dependencies").get_json()
+
+    results = {}
+    print(f"\n{'callback':<22}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'KiB mean':>10}{'KiB max':>9}{'peak KiB':>10}")
+    for name, grid in input_grids().items():
+        if args.only and name not in args.only:
+            continue
+        run = e2e_runner(name, client, dependencies) if args.e2e else direct_runner(name)
+        result = results[name] = measure(run, sample(grid, args.limit), args.repeat, not args.no_memory)
+        peak = f"{result['peak_kib']:.0f}" if result["peak_kib"] is not None else "-"
+        print(f"{name:<22}{result['calls']:>7}{result['p50_ms']:>9.2f}{result['p95_ms']:>9.2f}"
+              f"{result['p99_ms']:>9.2f}{result['bytes_mean'] / 1024:>10.1f}"
+              f"{result['bytes_max'] / 1024:>9.1f}{peak:>10}")
+
+    report = {
+        "metadata": {
+            "mode": mode,
+            "repeat": args.repeat,
+            "limit": args.limit,
+            "python": platform.python_version(),
+            "dash": dash.__version__,
+            "plotly": plotly.__version__,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "results": results,
+    }
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nbaseline written to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+        if baseline["metadata"]["mode"] != mode:
+            print(f"warning: baseline was recorded in {baseline['metadata']['mode']} mode", file=sys.stderr)
+        if compare(results, baseline, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Profile a cold start: module imports, dataset loads and the first page.
+
+    python benchmarks/bench_startup.py [--repeat N] [--top N] [--preload] [--json FILE]
+
+Each run is a fresh interpreter with `-X importtime`; the report splits the
+wall time into phases and lists the slowest imports and dataset loads.
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PHASES = ("import", "datasets", "layout")
+
+# runs in the child; phase markers go to stderr between the importtime lines
+CHILD = """
+import json, sys, time
+
+def phase(name):
+    print(f"#phase {name}", file=sys.stderr, flush=True)
+    return time.perf_counter()
+
+timings = {}
+started = phase("import")
+import app
+timings["import"] = time.perf_counter() - started
+
+started = phase("datasets")
+if PRELOAD:
+    app.create_server(preload=True)
+else:
+    app.datasets.load_all()
+timings["datasets"] = time.perf_counter() - started
+
+started = phase("layout")
+response = app.server.test_client().get("/")
+assert response.status_code == 200, response.status_code
+timings["layout"] = time.perf_counter() - started
+phase("end")
+
+print(json.dumps({"timings": timings, "datasets": app.datasets.stats()}))
+"""
+
+IMPORT_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def parse_imports(stderr):
+    # phase -> [(cumulative seconds, self seconds, depth, module)] in import order
+    imports = {phase: [] for phase in PHASES}
+    current = None
+    for line in stderr.splitlines():
+        if line.startswith("#phase "):
+            current = line.split()[1]
+            continue
+        match = IMPORT_LINE.match(line)
+        if match and current in imports:
+            own, cumulative, indent, module = match.groups()
+            imports[current].append((int(cumulative) / 1e6, int(own) / 1e6, len(indent) // 2, module))
+    return imports
+
+
+def run_once(preload):
+    child = CHILD.replace("PRELOAD", "True" if preload else "False")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", child],
+        cwd=ROOT, capture_output=True, text=True, check=False,
+    )
+    if result.returncode != 0:
+        sys.stderr.write(result.stderr[-4000:])
+        raise SystemExit(f"startup run failed with exit code {result.returncode}")
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    report["imports"] = parse_imports(result.stderr)
+    return report
+
+
+def top_imports(imports, count):
+    # slowest outermost imports of a phase (nested ones are included in their parent's
+    # time); below a single root such as `app`, its direct imports
+    depth = min((entry[2] for entry in imports), default=0)
+    roots = [entry for entry in imports if entry[2] == depth]
+    while len(roots) == 1 and any(entry[2] > depth for entry in imports):
+        depth += 1
+        roots = [entry for entry in imports if entry[2] == depth]
+    return sorted(roots, reverse=True)[:count]
+
+
+def heaviest_packages(imports, count):
+    # self time summed per top-level package
+    totals = {}
+    for _, own, _, module in imports:
+        package = module.split(".")[0]
+        totals[package] = totals.get(package, 0.0) + own
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)[:count]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3, help="cold starts to run")
+    parser.add_argument("--top", type=int, default=10, help="imports listed per phase")
+    parser.add_argument("--preload", action="store_true", help="load datasets via create_server(preload=True)")
+    parser.add_argument("--json", metavar="FILE", help="also write the report as JSON")
+    args = parser.parse_args()
+
+    runs = [run_once(args.preload) for _ in range(args.repeat)]
+    last = runs[-1]
+    timings = {phase: statistics.median(run["timings"][phase] for run in runs) for phase in PHASES}
+
+    total = sum(timings.values())
+    print(f"cold start {total:.3f}s (median of {len(runs)})")
+    for phase in PHASES:
+        print(f"  {phase:<10}{timings[phase]:>8.3f}s")
+
+    for phase in PHASES:
+        imports = last["imports"][phase]
+        if not imports:
+            continue
+        print(f"\n{phase}: {len(imports)} modules imported")
+        print(f"  {'cumulative':>10}  module")
+        for cumulative, _, _, module in top_imports(imports, args.top):
+            print(f"  {cumulative:>9.3f}s  {module}")
+        print(f"  {'self':>10}  package")
+        for package, own in heaviest_packages(imports, args.top):
+            print(f"  {own:>9.3f}s  {package}")
+
+    print(f"\n{'dataset':<20}{'load s':>8}")
+    for name, dataset in last["datasets"].items():
+        seconds = f"{dataset['load_seconds']:.3f}" if dataset["load_seconds"] is not None else "-"
+        print(f"{name:<20}{seconds:>8}")
+
+    if args.json:
+        report = {"timings": timings, "runs": [run["timings"] for run in runs],
+                  "datasets": last["datasets"], "imports": last["imports"]}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nreport written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""Clientside callback mode, enabled with CLIENTSIDE_CALLBACKS=1.
+
+The option lists and the small, fixed figure grids are computed once on the
+server and served as one JSON document at LOOKUPS_PATH; assets/clientside.js
+fetches it once per page and answers these callbacks in the browser.
+"""
+import hashlib
+import json
+
+from dash import dcc
+from dash.dependencies import ClientsideFunction, Input, Output, State
+
+from figure_cache import normalize
+from lazy_imports import LazyModule
+
+plotly_json = LazyModule("plotly.io.json")
+
+LOOKUPS_PATH = "/clientside/lookups.json"
+# layout store holding the lookups URL, read by the clientside functions
+URL_STORE = "clientside-lookups-url"
+
+# figure builder name -> (graph id, input component ids in argument order)
+FIGURE_CARDS = {
+    "motiv_barrier": ("mb-diverging-bar", ["mb-type-radio", "mb-gender-dropdown", "mb-year-dropdown"]),
+    "activity_stacked_bar": ("activity-stacked-bar", ["activity-type-dropdown", "activity-demographic-dropdown",
+                                                      "activity-display-mode", "activity-year-dropdown"]),
+    "gender_comparison": ("gender-comparison-bar", ["gender-type-dropdown", "gender-dimension-dropdown",
+                                                    "gender-display-mode", "gender-year-dropdown"]),
+    "errorBar": ("errorBar-figure", ["errorBar-voltype-dropdown", "errorBar-demographic-dropdown",
+                                     "errorBar-year-dropdown"]),
+}
+
+
+def client_key(args):
+    # must match JSON.stringify(args) in assets/clientside.js
+    return json.dumps(list(normalize(tuple(args))), separators=(",", ":"), ensure_ascii=False)
+
+
+def render(figure_cache, name, args):
+    # pre-rendered bundle first, then the undecorated builder so the LRU isn't filled
+    # with figures the server will never be asked for
+    figure = figure_cache.bundled(name, args)
+    if figure is not None:
+        return figure
+    return figure_cache.prepare(figure_cache.functions[name](*args))
+
+
+def figure_store_data(figure_cache, name, grid):
+    # Templates are identical across a card's figures, so they are shipped once
+    templates = []
+    template_ids = {}
+    figures = {}
+    for args in grid:
+        figure = render(figure_cache, name, args)
+        layout = dict(figure.get("layout", {}))
+        template = layout.pop("template", None)
+        template_json = json.dumps(template, sort_keys=True)
+        if template_json not in template_ids:
+            template_ids[template_json] = len(templates)
+            templates.append(template)
+        figures[client_key(args)] = [template_ids[template_json], dict(figure, layout=layout)]
+    return {"templates": templates, "figures": figures}
+
+
+def options_store_data(options_callback, values):
+    return {
+        value: dict(zip(("options", "value"), options_callback(value)))
+        for value in values
+    }
+
+
+def register(app, option_targets):
+    """Register the clientside callbacks.
+
+    option_targets maps a source dropdown id to the dropdown whose options it
+    selects. The lookups they read come from build_lookups().
+    """
+    app.clientside_callback(
+        ClientsideFunction("volunteer", "toggle_offcanvas"),
+        Output("offcanvas", "is_open"),
+        Input("open-offcanvas", "n_clicks"),
+        State("offcanvas", "is_open"),
+    )
+
+    for source_id, target_id in option_targets.items():
+        app.clientside_callback(
+            ClientsideFunction("volunteer", "options_lookup"),
+            Output(target_id, "options"),
+            Output(target_id, "value"),
+            Input(source_id, "value"),
+            State(target_id, "id"),
+            State(URL_STORE, "data"),
+        )
+
+    for graph_id, input_ids in FIGURE_CARDS.values():
+        app.clientside_callback(
+            ClientsideFunction("volunteer", "figure_lookup"),
+            Output(graph_id, "figure"),
+            *[Input(input_id, "value") for input_id in input_ids],
+            State(graph_id, "id"),
+            State(URL_STORE, "data"),
+        )
+
+
+def url_store(app):
+    # the one component the clientside mode adds to the layout
+    return dcc.Store(id=URL_STORE, data=app.get_relative_path(LOOKUPS_PATH))
+
+
+class Lookups:
+    # the lookup data as served at LOOKUPS_PATH
+
+    def __init__(self, data):
+        self.json_bytes = plotly_json.to_json_plotly(data).encode("utf-8")
+        self.etag = hashlib.sha1(self.json_bytes).hexdigest()
+
+
+def build_lookups(figure_cache, grids, option_lists):
+    """Lookups for every clientside callback.
+
+    grids is app.figure_input_grid(); option_lists maps a target dropdown id
+    to options_store_data(...).
+    """
+    figures = {
+        graph_id: figure_store_data(figure_cache, name, grids[name])
+        for name, (graph_id, _) in FIGURE_CARDS.items()
+    }
+    return Lookups({"options": option_lists, "figures": figures})
@@ -0,0 +1,166 @@
+"""Smaller callback payloads: figure minification and response compression.
+
+minify_figure() rounds float arrays to FIGURE_PRECISION decimals and writes
+them as JSON lists, downcasts integer arrays and drops Plotly defaults and
+unused template parts. ResponseCompressor gzip- or brotli-encodes the Dash
+JSON endpoints (COMPRESS_RESPONSES=1).
+"""
+import base64
+import gzip
+
+from flask import request
+
+from lazy_imports import LazyModule
+
+np = LazyModule("numpy")
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# attributes whose value equals the Plotly default, by where they appear
+TRACE_DEFAULTS = {'xaxis': 'x', 'yaxis': 'y', 'legendgroup': '', 'offsetgroup': '', 'alignmentgroup': ''}
+AXIS_DEFAULTS = {'domain': [0.0, 1.0]}
+PATTERN_DEFAULTS = {'shape': ''}
+
+# template layout entries that only style one kind of subplot -> trace types drawn on it
+SUBPLOT_TRACES = {
+    'geo': {'choropleth', 'scattergeo'},
+    'polar': {'barpolar', 'scatterpolar', 'scatterpolargl'},
+    'ternary': {'scatterternary'},
+    'scene': {'scatter3d', 'surface', 'mesh3d', 'cone', 'streamtube', 'isosurface', 'volume'},
+    'mapbox': {'scattermapbox', 'choroplethmapbox', 'densitymapbox'},
+    'map': {'scattermap', 'choroplethmap', 'densitymap'},
+}
+
+# integer dtypes Plotly's typed-array encoding supports, smallest first
+INT_DTYPES = ['i1', 'u1', 'i2', 'u2', 'i4', 'u4']
+
+
+def _decode(typed):
+    # {'dtype': 'f8', 'bdata': ..., 'shape': '4, 3'} -> ndarray
+    values = np.frombuffer(base64.b64decode(typed['bdata']), dtype=typed['dtype'])
+    if 'shape' in typed:
+        values = values.reshape([int(n) for n in typed['shape'].split(',')])
+    return values
+
+
+def _encode(values):
+    typed = {'dtype': values.dtype.str.lstrip('<|'), 'bdata': base64.b64encode(values.tobytes()).decode('ascii')}
+    if values.ndim > 1:
+        typed['shape'] = ', '.join(str(n) for n in values.shape)
+    return typed
+
+
+def _minify_array(values, precision):
+    if values.dtype.kind == 'f':
+        # NaN becomes null in JSON, which Plotly also treats as a gap
+        return np.round(values, precision).tolist()
+    if values.dtype.kind in 'iu' and values.size:
+        low, high = values.min(), values.max()
+        for dtype in INT_DTYPES:
+            if np.dtype(dtype).itemsize >= values.itemsize:
+                break
+            if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max:
+                values = values.astype(dtype)
+                break
+    return _encode(values)
+
+
+def _without_defaults(attributes, defaults):
+    return {key: value for key, value in attributes.items() if key not in defaults or defaults[key] != value}
+
+
+def _minify(value, precision):
+    if isinstance(value, dict):
+        if 'bdata' in value and 'dtype' in value:
+            return _minify_array(_decode(value), precision)
+        result = {}
+        for key, item in value.items():
+            if key == 'pattern' and isinstance(item, dict):
+                item = _without_defaults(item, PATTERN_DEFAULTS)
+            item = item if key == 'geojson' else _minify(item, precision)
+            if item is None or (isinstance(item, dict) and not item):
+                continue
+            result[key] = item
+        return result
+    if isinstance(value, (list, tuple)):
+        return [_minify(item, precision) for item in value]
+    if isinstance(value, np.ndarray):
+        return _minify_array(value, precision) if value.dtype.kind in 'fiu' else value
+    if isinstance(value, (float, np.floating)):
+        return round(float(value), precision)
+    return value
+
+
+def _prune_template(template, trace_types):
+    if not isinstance(template, dict):
+        return template
+    pruned = dict(template)
+    if isinstance(template.get('data'), dict):
+        pruned['data'] = {kind: value for kind, value in template['data'].items() if kind in trace_types}
+    if isinstance(template.get('layout'), dict):
+        pruned['layout'] = {key: value for key, value in template['layout'].items()
+                            if key not in SUBPLOT_TRACES or not SUBPLOT_TRACES[key].isdisjoint(trace_types)}
+    return pruned
+
+
+def minify_figure(figure, precision=4):
+    # figure dict (or tuple of them, as the memoized builders return); anything else unchanged
+    if isinstance(figure, tuple):
+        return tuple(minify_figure(f, precision) for f in figure)
+    if not isinstance(figure, dict) or 'data' not in figure:
+        return figure
+    trace_types = {trace.get('type', 'scatter') for trace in figure['data']}
+    layout = {}
+    for key, value in figure.get('layout', {}).items():
+        if key == 'template':
+            value = _prune_template(value, trace_types)
+        else:
+            if key.startswith(('xaxis', 'yaxis')) and isinstance(value, dict):
+                value = _without_defaults(value, AXIS_DEFAULTS)
+            value = _minify(value, precision)
+            if value is None or (isinstance(value, dict) and not value):
+                continue
+        layout[key] = value
+    data = [_minify(_without_defaults(trace, TRACE_DEFAULTS), precision) for trace in figure['data']]
+    return dict(figure, data=data, layout=layout)
+
+
+class ResponseCompressor:
+
+    def __init__(self, endpoints, min_bytes=1024, level=6):
+        # endpoints: last path segments to compress, e.g. "_dash-update-component"
+        self.endpoints = set(endpoints)
+        self.min_bytes = min_bytes
+        self.level = level
+
+    def choose_encoding(self, accept_encodings):
+        offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+        return accept_encodings.best_match(offered)
+
+    def compress(self, body, encoding):
+        if encoding == 'br':
+            return brotli.compress(body, quality=min(self.level, 11))
+        return gzip.compress(body, compresslevel=self.level, mtime=0)
+
+    def after_request(self, response):
+        # Flask after_request hook
+        if (request.path.rsplit('/', 1)[-1] not in self.endpoints
+                or response.status_code != 200
+                or response.direct_passthrough
+                or 'Content-Encoding' in response.headers):
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding(request.accept_encodings)
+        body = response.get_data()
+        if encoding is None or len(body) < self.min_bytes:
+            return response
+        response.set_data(self.compress(body, encoding))
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            # same content, different bytes: conditional requests still match a weak tag
+            response.set_etag(etag, weak=True)
+        return response
@@ -0,0 +1,114 @@
+"""Indexed, read-only views over the dashboard DataFrames.
+
+Each frame is partitioned once at startup, so a callback lookup is a dict
+access instead of chained boolean masks. GeoIndex also keeps per-year values
+and extremes for the insights panel; TrendIndex keeps the time series as
+arrays sorted by (demographic, category, year), so a series is a slice.
+"""
+from lazy_imports import LazyModule
+
+np = LazyModule("numpy")
+
+
+class GeoIndex:
+    # Geo_interpolated_by_year.json, keyed by (year, region)
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.regions = frame['region'].unique()
+        self.columns = {column: i for i, column in enumerate(frame.select_dtypes('number').columns)}
+        self.by_year = {}
+        self.positions = {}
+        self.values = {}
+        self.extremes = {}
+        for year, group in frame.groupby('year', sort=True, observed=True):
+            year = int(year)
+            group = group.reset_index(drop=True)
+            self.by_year[year] = group
+            self.positions[year] = {region: pos for pos, region in enumerate(group['region'])}
+            values = group[list(self.columns)].to_numpy(dtype=float)
+            self.values[year] = values
+            # first position of the max/min per column, NaN skipped as idxmax/idxmin do
+            missing = np.isnan(values)
+            highest = np.where(missing, -np.inf, values).argmax(axis=0)
+            lowest = np.where(missing, np.inf, values).argmin(axis=0)
+            self.extremes[year] = {column: (highest[i], lowest[i]) for column, i in self.columns.items()}
+
+    def year(self, year):
+        return self.by_year.get(int(year), self.frame.iloc[0:0])
+
+    def has_region(self, year, region):
+        return region in self.positions.get(int(year), {})
+
+    def value(self, year, region, column):
+        return self.row(year, region, column)[0]
+
+    def row(self, year, region, *columns):
+        # values of several columns for one region, one array lookup
+        year = int(year)
+        values = self.values[year][self.positions[year][region]]
+        return tuple(values[self.columns[column]].item() for column in columns)
+
+    def highest_lowest(self, year, column):
+        # ((region, value) with the highest value, (region, value) with the lowest)
+        year = int(year)
+        regions = self.by_year[year]['region']
+        values = self.values[year][:, self.columns[column]]
+        return tuple((regions.iat[pos], values[pos].item()) for pos in self.extremes[year][column])
+
+
+class TrendIndex:
+    # volunteering_time_series_fake.json, keyed by demographic and (demographic, category)
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.years = sorted(int(y) for y in frame['year'].unique())
+        self.demographics = sorted(frame['demographic'].unique())
+        # categories in order of first appearance, as the line chart legend expects
+        categories = frame.groupby('demographic', sort=False, observed=True)['category'].unique()
+        self.categories = {demographic: list(values) for demographic, values in categories.items()}
+
+        # One sort at startup: every column as a single array ordered by (demographic,
+        # category, year), so each category's series is a contiguous, year-sorted slice
+        ordered = frame.sort_values(['demographic', 'category', 'year'], kind='stable')
+        self.value_columns = [c for c in frame.columns if c.endswith(('_volunteer_perc', '_volunteer_count'))]
+        self.columns = {'year': ordered['year'].to_numpy()}
+        for column in self.value_columns:
+            self.columns[column] = ordered[column].to_numpy()
+        for values in self.columns.values():
+            values.flags.writeable = False  # handed out as views, shared by every request
+        self.slices = {}
+        for key, rows in ordered.groupby(['demographic', 'category'], sort=False, observed=True).indices.items():
+            self.slices[key] = (rows[0], rows[-1] + 1)
+
+    def category_series(self, demographic, category, year_range=None):
+        # {'year': years, column: values} for one category, year-sorted; views, not copies
+        start, stop = self.slices.get((demographic, category), (0, 0))
+        if year_range is not None:
+            years = self.columns['year'][start:stop]
+            start, stop = (start + years.searchsorted(year_range[0], side='left'),
+                           start + years.searchsorted(year_range[1], side='right'))
+        return {column: values[start:stop] for column, values in self.columns.items()}
+
+    def sorted_categories(self, demographic):
+        return sorted(self.categories.get(demographic, []))
+
+
+class MotivBarrierIndex:
+    # motivations_barriers_fake_data.json, keyed by (type, gender, year)
+
+    def __init__(self, frame):
+        self.frame = frame
+        self.genders = list(frame['gender'].unique())
+        self.groups = {}
+        for (type_, gender, year), group in frame.groupby(['type', 'gender', 'year'], sort=False, observed=True):
+            # the chart always shows categories ordered by 'fully agree'
+            self.groups[(type_, gender, int(year))] = (
+                group.sort_values('fully_agree', ascending=True).reset_index(drop=True)
+            )
+
+    def get(self, type_, gender, year):
+        try:
+            return self.groups[(type_, gender, int(year))]
+        except (KeyError, TypeError, ValueError):
+            return self.frame.iloc[0:0]
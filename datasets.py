@@ -0,0 +1,180 @@
+"""Per-card datasets that load on first use.
+
+Each dataset is registered with a loader and built the first time it is
+asked for. watch() polls the files a dataset was read from and swaps in a
+reloaded value; listeners are told which dataset was replaced. Values are
+shared between threads and must be treated as immutable.
+"""
+import os
+import sys
+import threading
+import time
+
+
+def file_signature(paths):
+    # (mtime, size) per file, None where a file doesn't exist
+    signature = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            signature.append(None)
+        else:
+            signature.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(signature)
+
+
+class LazyDataset:
+
+    def __init__(self, name, loader, files=()):
+        self.name = name
+        self._loader = loader
+        self._value = None
+        self._lock = threading.Lock()
+        self.files = list(files)
+        self.signature = None
+        self.failed_signature = None
+        self.load_seconds = None
+        self.reloads = 0
+
+    @property
+    def loaded(self):
+        return self._value is not None
+
+    def get(self):
+        value = self._value
+        if value is None:
+            with self._lock:
+                # another thread may have finished loading while we waited
+                if self._value is None:
+                    self._load()
+                value = self._value
+        return value
+
+    def _load(self):
+        # signature taken first: a write during loading shows up as a change next time
+        signature = file_signature(self.files)
+        started = time.perf_counter()
+        self._value = self._loader()
+        self.load_seconds = time.perf_counter() - started
+        self.signature = signature
+
+    def changed(self):
+        # files differ from the loaded snapshot (and haven't already failed to load)
+        if not self.files or not self.loaded:
+            return False
+        signature = file_signature(self.files)
+        return signature != self.signature and signature != self.failed_signature
+
+    def reload(self):
+        # the old value is served until the new one is complete
+        with self._lock:
+            signature = file_signature(self.files)
+            try:
+                self._load()
+            except Exception:
+                self.failed_signature = signature
+                raise
+            self.failed_signature = None
+            self.reloads += 1
+
+    def reset(self):
+        # drop the value, the next get() builds it again
+        with self._lock:
+            self._value = None
+
+
+class DatasetRegistry:
+
+    def __init__(self):
+        self._datasets = {}
+        self._listeners = []
+        self._warm_thread = None
+        self._watch_thread = None
+        self._load_threads = {}
+
+    def register(self, name, loader, files=()):
+        self._datasets[name] = LazyDataset(name, loader, files)
+
+    def __getitem__(self, name):
+        return self._datasets[name].get()
+
+    def __iter__(self):
+        return iter(self._datasets)
+
+    def dataset(self, name):
+        return self._datasets[name]
+
+    def load_all(self):
+        for dataset in self._datasets.values():
+            dataset.get()
+
+    def warm_in_background(self):
+        # idempotent; errors are reported, the dataset will retry on its next use
+        if self._warm_thread is not None:
+            return
+
+        def warm():
+            for dataset in self._datasets.values():
+                try:
+                    dataset.get()
+                except Exception as err:  # noqa: BLE001 - keep warming the others
+                    print(f"warming dataset {dataset.name} failed: {err}", file=sys.stderr)
+
+        self._warm_thread = threading.Thread(target=warm, name="dataset-warmup", daemon=True)
+        self._warm_thread.start()
+
+    def load_in_background(self, name):
+        # idempotent; builds one dataset in a daemon thread, for values too slow to build in a request
+        if name in self._load_threads:
+            return
+        dataset = self._datasets[name]
+
+        def load():
+            try:
+                dataset.get()
+            except Exception as err:  # noqa: BLE001 - it is retried on its next use
+                print(f"loading dataset {name} failed: {err}", file=sys.stderr)
+
+        self._load_threads[name] = threading.Thread(target=load, name=f"dataset-{name}", daemon=True)
+        self._load_threads[name].start()
+
+    def add_listener(self, listener):
+        # listener(name) runs in the watcher thread after a dataset was swapped
+        self._listeners.append(listener)
+
+    def reload_changed(self):
+        # reloads every loaded dataset whose files changed; returns their names
+        reloaded = []
+        for dataset in self._datasets.values():
+            if not dataset.changed():
+                continue
+            try:
+                dataset.reload()
+            except Exception as err:  # noqa: BLE001 - e.g. a half-written file, keep the old data
+                print(f"reloading dataset {dataset.name} failed, keeping the loaded data: {err}", file=sys.stderr)
+                continue
+            print(f"reloaded dataset {dataset.name} in {dataset.load_seconds:.2f}s", file=sys.stderr)
+            reloaded.append(dataset.name)
+            for listener in self._listeners:
+                listener(dataset.name)
+        return reloaded
+
+    def watch(self, interval):
+        # idempotent; polls the registered files every `interval` seconds in a daemon thread
+        if self._watch_thread is not None:
+            return
+
+        def poll():
+            while True:
+                time.sleep(interval)
+                self.reload_changed()
+
+        self._watch_thread = threading.Thread(target=poll, name="dataset-watcher", daemon=True)
+        self._watch_thread.start()
+
+    def stats(self):
+        return {
+            name: {'loaded': dataset.loaded, 'load_seconds': dataset.load_seconds, 'reloads': dataset.reloads}
+            for name, dataset in self._datasets.items()
+        }
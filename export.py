@@ -0,0 +1,223 @@
+"""Bulk export of the card data and of rendered chart images.
+
+GET /export/<card> streams a card's rows as CSV or Parquet (?format=parquet);
+other query arguments filter on the column of that name, year_from/year_to
+bound the year.
+
+POST /export/images queues figures to be rendered by a small thread pool:
+
+    {"views": [{"figure": "errorBar", "args": ["Formal", "Total", 2022]}, ...],
+     "format": "png", "scale": 1}
+
+and answers 202 with a job id; GET /export/images/<id> reports progress and
+/export/images/<id>/download returns a zip. Rendering needs `kaleido`.
+"""
+import io
+import math
+import secrets
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from flask import Response, jsonify, request
+
+from lazy_imports import LazyModule, available
+
+pd = LazyModule("pandas")
+# optional, for ?format=parquet
+pa = LazyModule("pyarrow") if available("pyarrow") else None
+pq = LazyModule("pyarrow.parquet") if pa is not None else None
+
+IMAGE_FORMATS = {'png', 'jpeg', 'webp', 'svg', 'pdf'}
+# image size multiplier; larger ones would let one request allocate huge bitmaps
+MAX_IMAGE_SCALE = 10
+
+
+def _filter(frame, args):
+    # query arguments -> row mask; raises ValueError on an unknown column or a bad value
+    mask = pd.Series(True, index=frame.index)
+    for key in args:
+        if key == 'format':
+            continue
+        values = args.getlist(key)
+        if key in ('year_from', 'year_to'):
+            bound = int(values[-1])
+            mask &= (frame['year'] >= bound) if key == 'year_from' else (frame['year'] <= bound)
+        elif key in frame.columns:
+            column = frame[key]
+            if pd.api.types.is_numeric_dtype(column):
+                values = pd.to_numeric(values, errors='raise')
+            mask &= column.isin(values)
+        else:
+            raise ValueError(f"unknown filter column {key!r}")
+    return frame[mask]
+
+
+def csv_chunks(frame, chunk_rows):
+    for start in range(0, max(len(frame), 1), chunk_rows):
+        yield frame.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0)
+
+
+def parquet_chunks(frame, chunk_rows):
+    # one row group per chunk; the bytes written so far are handed out after each one
+    buffer = io.BytesIO()
+    schema = pa.Schema.from_pandas(frame, preserve_index=False)
+    with pq.ParquetWriter(buffer, schema) as writer:
+        for start in range(0, len(frame), chunk_rows):
+            chunk = frame.iloc[start:start + chunk_rows]
+            writer.write_table(pa.Table.from_pandas(chunk, schema=schema, preserve_index=False))
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()  # footer
+
+
+class ImageJob:
+
+    def __init__(self, views, image_format, scale):
+        self.id = secrets.token_hex(8)
+        self.views = views
+        self.format = image_format
+        self.scale = scale
+        self.state = 'queued'
+        self.done = 0
+        self.errors = []
+        self.created = time.time()
+        self.finished = None
+        self.result = None
+
+    def status(self):
+        return {
+            'id': self.id,
+            'state': self.state,
+            'views': len(self.views),
+            'done': self.done,
+            'errors': self.errors,
+            'seconds': (self.finished or time.time()) - self.created,
+        }
+
+
+class Exporter:
+
+    def __init__(self, render, chunk_rows=50000, image_workers=2, max_views=500, max_jobs=100):
+        # render(figure_name, args) -> figure dict or tuple of them, or raises KeyError for an unknown figure
+        self.render = render
+        self.chunk_rows = chunk_rows
+        self.max_views = max_views
+        self.max_jobs = max_jobs
+        self.sources = {}  # card -> function returning its DataFrame
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=image_workers, thread_name_prefix="image-export")
+
+    def register(self, card, frame):
+        self.sources[card] = frame
+
+    def init_app(self, server):
+        server.add_url_rule("/export/<card>", "export_data", self.export_data)
+        server.add_url_rule("/export/images", "export_images", self.submit_images, methods=["POST"])
+        server.add_url_rule("/export/images/<job_id>", "export_image_status", self.image_status)
+        server.add_url_rule("/export/images/<job_id>/download", "export_image_download", self.image_download)
+
+    def export_data(self, card):
+        if card not in self.sources:
+            return jsonify(error=f"unknown card {card!r}", cards=sorted(self.sources)), 404
+        file_format = request.args.get('format', 'csv')
+        if file_format not in ('csv', 'parquet'):
+            return jsonify(error="format must be csv or parquet"), 400
+        if file_format == 'parquet' and pq is None:
+            return jsonify(error="parquet export needs pyarrow"), 501
+        try:
+            frame = _filter(self.sources[card](), request.args)
+        except (ValueError, TypeError) as err:
+            return jsonify(error=str(err)), 400
+
+        headers = {'Content-Disposition': f'attachment; filename="{card}.{file_format}"'}
+        if file_format == 'parquet':
+            return Response(parquet_chunks(frame, self.chunk_rows),
+                            mimetype='application/vnd.apache.parquet', headers=headers)
+        return Response(csv_chunks(frame, self.chunk_rows), mimetype='text/csv', headers=headers)
+
+    def submit_images(self):
+        if not available("kaleido"):
+            return jsonify(error="image export needs the kaleido package"), 501
+        body = request.get_json(silent=True) or {}
+        views = body.get('views')
+        image_format = body.get('format', 'png')
+        if not isinstance(views, list) or not views:
+            return jsonify(error="views must be a non-empty list"), 400
+        if len(views) > self.max_views:
+            return jsonify(error=f"at most {self.max_views} views per job"), 400
+        if image_format not in IMAGE_FORMATS:
+            return jsonify(error=f"format must be one of {sorted(IMAGE_FORMATS)}"), 400
+        for view in views:
+            if not isinstance(view, dict) or not isinstance(view.get('figure'), str) \
+                    or not isinstance(view.get('args', []), list):
+                return jsonify(error="each view needs a figure name and an args list"), 400
+        try:
+            scale = float(body.get('scale', 1))
+        except (TypeError, ValueError):
+            scale = math.nan
+        if not 0 < scale <= MAX_IMAGE_SCALE:
+            return jsonify(error=f"scale must be a number above 0 and at most {MAX_IMAGE_SCALE}"), 400
+
+        job = ImageJob(views, image_format, scale)
+        with self._lock:
+            self._jobs[job.id] = job
+            # keep the newest max_jobs; finished ones go first
+            while len(self._jobs) > self.max_jobs:
+                old = next((j for j in self._jobs.values() if j.state in ('done', 'failed')), None)
+                if old is None:
+                    break
+                del self._jobs[old.id]
+        self._pool.submit(self._run, job)
+        return jsonify(job.status()), 202
+
+    def _run(self, job):
+        import plotly.io as pio
+
+        job.state = 'running'
+        archive = io.BytesIO()
+        try:
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                for i, view in enumerate(job.views):
+                    name = view['figure']
+                    try:
+                        figures = self.render(name, view.get('args', []))
+                        if not isinstance(figures, tuple):
+                            figures = (figures,)
+                        for part, figure in enumerate(figures):
+                            suffix = f"-{part}" if len(figures) > 1 else ""
+                            image = pio.to_image(figure, format=job.format, scale=job.scale)
+                            zf.writestr(f"{i:04d}-{name}{suffix}.{job.format}", image)
+                    except Exception as err:  # noqa: BLE001 - one bad view doesn't fail the batch
+                        job.errors.append({'view': i, 'error': f"{type(err).__name__}: {err}"})
+                    job.done = i + 1
+        except Exception as err:  # noqa: BLE001 - reported through the job status
+            job.errors.append({'view': None, 'error': f"{type(err).__name__}: {err}"})
+            job.state = 'failed'
+        else:
+            job.result = archive.getvalue()
+            job.state = 'done'
+        job.finished = time.time()
+
+    def _job(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def image_status(self, job_id):
+        job = self._job(job_id)
+        if job is None:
+            return jsonify(error="unknown job"), 404
+        return jsonify(job.status())
+
+    def image_download(self, job_id):
+        job = self._job(job_id)
+        if job is None:
+            return jsonify(error="unknown job"), 404
+        if job.state != 'done':
+            return jsonify(job.status()), 409
+        return Response(job.result, mimetype='application/zip',
+                        headers={'Content-Disposition': f'attachment; filename="images-{job.id}.zip"'})
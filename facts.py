@@ -0,0 +1,240 @@
+"""The nested activity, gender and error-bar assets as one long, categorical fact table.
+
+    source  year  vol_type  dimension  category  group  measure  value  position
+
+group is a second split where the asset has one (Men/Women, the activity
+demographic group); position keeps each asset's record order. The table is
+sorted so every (source, year, vol_type, dimension[, measure]) is one slice.
+query() returns matching rows, wide() one column per measure.
+"""
+from lazy_imports import LazyModule
+
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+KEYS = ['source', 'year', 'vol_type', 'dimension']
+COLUMNS = KEYS + ['category', 'group', 'measure', 'value', 'position']
+
+GENDER_LABELS = ['num_orgs', 'task', 'area', 'hours_range/week']
+
+
+CATEGORICAL = ['source', 'vol_type', 'dimension', 'category', 'group', 'measure']
+
+
+def _map_categories(column, func):
+    # categorical Series -> Categorical with func() applied to its categories, computed per
+    # category on the codes; categories that map to the same string are merged
+    column = column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype('category')
+    mapped = pd.Index([func(value) for value in column.cat.categories], dtype=str)
+    categories = mapped.unique()
+    lookup = np.append(categories.get_indexer(mapped), -1)  # code -1 (missing) stays -1
+    return pd.Categorical.from_codes(lookup[column.cat.codes.to_numpy()], categories)
+
+
+def _categorical(value, length):
+    # a key column: a Series keeps its codes, a constant is one category
+    if isinstance(value, pd.Series):
+        return _map_categories(value, str)
+    return pd.Categorical.from_codes(np.zeros(length, dtype='int8'), pd.Index([value], dtype=str))
+
+
+def _melt(source, frame, keys, measures):
+    # keys: fact column -> Series aligned with frame, or a constant;
+    # measures: frame column -> fact columns that differ per measure (at least 'measure').
+    # Returns {fact column: [one array per measure]}, categorical columns as Categoricals
+    columns = {column: [] for column in COLUMNS}
+    length = len(frame)
+    keys = dict(keys, source=source)
+    shared = {key: _categorical(value, length) for key, value in keys.items()}
+    for column, fields in measures.items():
+        for key in CATEGORICAL:
+            value = fields[key] if key in fields else shared[key]
+            columns[key].append(value if isinstance(value, pd.Categorical) else _categorical(value, length))
+        columns['year'].append(frame['year'].to_numpy())
+        columns['value'].append(frame[column].to_numpy(dtype=float))
+        columns['position'].append(np.arange(length, dtype='int32'))
+    return columns
+
+
+def _first_present(frame, columns):
+    # per row, the first of `columns` that isn't missing as a Categorical, and the index
+    # in `columns` of the column it came from (-1 if none)
+    columns = [c for c in columns if c in frame.columns]
+    parts = [_map_categories(frame[column], str) for column in columns]
+    categories = pd.Index([], dtype=str).append([part.categories for part in parts]).unique()
+    codes = np.full(len(frame), -1)
+    labels = np.full(len(frame), -1)
+    for i, part in reversed(list(enumerate(parts))):
+        present = part.codes >= 0
+        codes[present] = categories.get_indexer(part.categories)[part.codes[present]]
+        labels[present] = i
+    return pd.Series(pd.Categorical.from_codes(codes, categories), index=frame.index), columns, labels
+
+
+def ingest(tables):
+    # {asset name: load_table() frame} -> (facts, dimension table)
+    parts = []
+    labels = {}  # (source, dimension) -> asset column the categories came from
+
+    for vol_type in ('formal', 'informal'):
+        activity = tables[f'activity_{vol_type}']
+        # the Total section's first record only carries all_volunteers
+        parts.append(_melt('activity', activity,
+                           {'vol_type': vol_type, 'dimension': activity['section'], 'category': activity['name'],
+                            'group': activity['category']},
+                           {'count': {'measure': 'count'}, 'all_volunteers': {'measure': 'all_volunteers'}}))
+        for section in activity['section'].unique():
+            labels[('activity', section)] = 'name'
+
+    gender = tables['gender']
+    # sections are '<Formal|Informal>_<dimension>', each names its categories in its own column;
+    # split per category, not per row
+    vol_types = pd.Series(_map_categories(gender['section'], lambda s: str(s).split('_', 1)[0].lower()))
+    dimensions = pd.Series(_map_categories(gender['section'], lambda s: str(s).split('_', 1)[1]))
+    category, label_columns, label = _first_present(gender, GENDER_LABELS)
+    parts.append(_melt('gender', gender,
+                       {'vol_type': vol_types, 'dimension': dimensions, 'category': category},
+                       {'men_count': {'measure': 'count', 'group': 'Men'},
+                        'women_count': {'measure': 'count', 'group': 'Women'},
+                        'men_perc': {'measure': 'perc', 'group': 'Men'},
+                        'women_perc': {'measure': 'perc', 'group': 'Women'}}))
+    dimension_codes = dimensions.cat.codes.to_numpy()
+    for code in np.unique(dimension_codes[label >= 0]):
+        # the label column of the dimension's first labelled record
+        first = np.flatnonzero((dimension_codes == code) & (label >= 0))[0]
+        labels[('gender', dimensions.cat.categories[code])] = label_columns[label[first]]
+
+    error_bars = tables['error_bars']
+    vol_types = pd.Series(_map_categories(error_bars['volunteering_type'], lambda v: str(v).lower()))
+    measures = ('persons_1000', 'avg_hours', 'percentile_25', 'percentile_50', 'percentile_75')
+    parts.append(_melt('error_bars', error_bars,
+                       {'vol_type': vol_types, 'dimension': error_bars['section'],
+                        'category': error_bars['category_value'], 'group': ''},
+                       {c: {'measure': c} for c in measures}))
+    for section in error_bars['section'].unique():
+        labels[('error_bars', section)] = 'category_value'
+
+    # categorical columns are combined on their codes, without a pass over strings
+    columns = {}
+    for column in COLUMNS:
+        arrays = [array for part in parts for array in part[column]]
+        if column in CATEGORICAL:
+            columns[column] = pd.api.types.union_categoricals(arrays, sort_categories=True)
+        else:
+            columns[column] = np.concatenate(arrays)
+    columns['year'] = columns['year'].astype('int16')
+    present = ~np.isnan(columns['value'])
+    facts = pd.DataFrame(columns)[present]
+    facts = facts.sort_values(KEYS + ['measure', 'position'], kind='stable').reset_index(drop=True)
+
+    # categories of each dimension in record order
+    rows = []
+    distinct = facts[facts['category'].cat.codes.to_numpy() >= 0]
+    distinct = distinct.sort_values(['source', 'dimension', 'position'], kind='stable')
+    for (source, dimension), group in distinct.groupby(['source', 'dimension'], sort=False, observed=True):
+        codes = pd.unique(group['category'].cat.codes.to_numpy())
+        rows.append({
+            'source': source,
+            'dimension': dimension,
+            'label': labels.get((source, dimension), 'category'),
+            'categories': list(group['category'].cat.categories[codes]),
+        })
+    return facts, pd.DataFrame(rows, columns=['source', 'dimension', 'label', 'categories'])
+
+
+def _equals(column, value):
+    # row mask of a categorical column, compared on its integer codes
+    categories = column.cat.categories
+    if value not in categories:
+        return np.zeros(len(column), dtype=bool)
+    return column.cat.codes.to_numpy() == categories.get_loc(value)
+
+
+def _vol_type(value):
+    return '' if value is None else str(value).lower()
+
+
+class FactTable:
+
+    def __init__(self, facts, dimensions):
+        self.frame = facts
+        self.dimensions = dimensions
+        self.labels = dict(zip(zip(dimensions['source'], dimensions['dimension']), dimensions['label']))
+        # contiguous row ranges of the sorted table, per KEYS and per KEYS + measure
+        self.slices = {}
+        for key, rows in facts.groupby(KEYS, sort=False, observed=True).indices.items():
+            self.slices[(key[0], int(key[1]), key[2], key[3])] = (rows[0], rows[-1] + 1)
+        self.measure_slices = {}
+        for key, rows in facts.groupby(KEYS + ['measure'], sort=False, observed=True).indices.items():
+            self.measure_slices[(key[0], int(key[1]), key[2], key[3], key[4])] = (rows[0], rows[-1] + 1)
+        self.sources = {}
+        for key, rows in facts.groupby('source', sort=False, observed=True).indices.items():
+            self.sources[key] = (rows[0], rows[-1] + 1)
+        self.source_years = {}
+        for source, year, vol_type, _ in self.slices:
+            self.source_years.setdefault((source, vol_type), set()).add(year)
+
+    @classmethod
+    def from_tables(cls, tables):
+        return cls(*ingest(tables))
+
+    def has_year(self, source, year, vol_type=None):
+        try:
+            return int(year) in self.source_years.get((source, _vol_type(vol_type)), ())
+        except (TypeError, ValueError):
+            return False
+
+    def label(self, source, dimension):
+        # asset column the dimension's categories came from
+        return self.labels.get((source, dimension), 'category')
+
+    def query(self, source, measure=None, year=None, vol_type=None, dimension=None, category=None):
+        # matching facts in record order; None leaves a key unconstrained
+        if year is not None and dimension is not None:
+            try:
+                key = (source, int(year), _vol_type(vol_type), dimension)
+            except (TypeError, ValueError):
+                return self.frame.iloc[0:0]
+            if measure is not None:
+                start, stop = self.measure_slices.get(key + (measure,), (0, 0))
+            else:
+                start, stop = self.slices.get(key, (0, 0))
+            rows = self.frame.iloc[start:stop]
+        else:
+            # bulk reads (exports): one integer comparison per row on the categorical codes
+            start, stop = self.sources.get(source, (0, 0))
+            rows = self.frame.iloc[start:stop]
+            if year is not None:
+                rows = rows[rows['year'].to_numpy() == int(year)]
+            if vol_type is not None:
+                rows = rows[_equals(rows['vol_type'], _vol_type(vol_type))]
+            if dimension is not None:
+                rows = rows[_equals(rows['dimension'], dimension)]
+            if measure is not None:
+                rows = rows[_equals(rows['measure'], measure)]
+        if category is not None:
+            rows = rows[_equals(rows['category'], category)]
+        return rows
+
+    def wide(self, source, year, vol_type, dimension, measures):
+        # one row per record with 'category', 'group' and a column per measure; None if there are no facts
+        rows = self.query(source, year=year, vol_type=vol_type, dimension=dimension)
+        if rows.empty:
+            return None
+        # np.unique sorts the positions, so the records come out in record order
+        positions = rows['position'].to_numpy()
+        records, first = np.unique(positions, return_index=True)
+        wide = {
+            'category': rows['category'].to_numpy()[first],
+            'group': rows['group'].to_numpy()[first],
+        }
+        measure_codes = rows['measure'].cat.codes.to_numpy()
+        categories = rows['measure'].cat.categories
+        values = rows['value'].to_numpy()
+        for measure in measures:
+            column = np.full(len(records), np.nan)
+            if measure in categories:
+                hit = measure_codes == categories.get_loc(measure)
+                column[np.searchsorted(records, positions[hit])] = values[hit]
+            wide[measure] = column
+        return pd.DataFrame(wide)
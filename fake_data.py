@@ -0,0 +1,395 @@
+"""Seeded synthetic data in every asset schema the dashboard reads.
+
+    python fake_data.py --output fake_assets [--years 4] [--regions 9]
+                        [--demographics N] [--categories N] [--format json|parquet|feather]
+    DATA_DIR=fake_assets python app.py
+
+Defaults reproduce the shape of the bundled assets; larger values add years,
+demographics, categories and regions (e.g. --trend-years 50 --demographics 200
+--categories 100 gives a million-row time series). Keep --years at 4 or more,
+the year dropdowns list 2006-2022.
+"""
+import argparse
+import json
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from assets_io import ASSETS, FORMATS, asset_path, to_columnar
+
+SURVEY_YEARS = [2006, 2012, 2016, 2022]
+
+LAENDER = ["Burgenland", "Kärnten", "Niederösterreich", "Oberösterreich", "Salzburg",
+           "Steiermark", "Tirol", "Vorarlberg", "Wien"]
+
+# lon_min, lon_max, lat_min, lat_max
+AUSTRIA_BBOX = (9.53, 17.16, 46.37, 49.02)
+
+VOLUNTEER_TYPES = ["any", "formal", "informal", "both_formal_and_informal", "formal_only", "informal_only"]
+
+# time series: demographic -> categories (a region demographic is added from the regions)
+TREND_DEMOGRAPHICS = {
+    "total": ["total"],
+    "gender": ["men", "women"],
+    "age": ["younger than 30 years", "30–39 years", "40–49 years", "50–59 years", "60–69 years",
+            "70–79 years", "80 years or older"],
+    "education": ["(max.) Compulsory education", "teaching, BMS", "matura", "university"],
+    "citizenship": ["Austria", "not Austria"],
+    "birth_country": ["Austria", "not Austria"],
+    "migration": ["1. Generation", "2. Generation", "no migration background"],
+    "employment": ["employed", "unemployed", "retired", "in training", "haushold leader", "miscellaneous"],
+    "occupation": ["auxiliary work", "middle job", "higher job", "highly qualified job"],
+    "municipality size classes": ["<= 2 500 inhabitants", "<= 10 000 inhabitants", "<= 100 000 inhabitants",
+                                  "> 100 000 inhabitants"],
+    "houshold size": ["1 Person", "2 Personen", "3 Personen", "4 or more persons"],
+    "single-person households": ["total", "men", "women"],
+    "multi-person households": ["total", "no kids", "with kids", "with 1 kid", "with 2 or more kids"],
+}
+
+FORMAL_ACTIVITIES = ["Disaster relief and rescue services", "Arts, culture, entertainment",
+                     "Environment, nature and animal protection", "Religion and Church", "Social and Health",
+                     "Political work and advocacy", "Civic activities and community", "Education",
+                     "Sports and exercise", "Refugee aid"]
+INFORMAL_ACTIVITIES = ["Various housework", "Repairs, craft work", "Visits to persons requiring care",
+                       "Care for people in need of care", "Travel services", "gardening", "Assistance in disasters",
+                       "Official procedures and correspondence", "Tutoring", "Childcare", "Care for refugees",
+                       "Other activity"]
+
+# activity charts: section -> categories ("Total" is added separately)
+ACTIVITY_SECTIONS = {
+    "Gender": ["Men", "Women"],
+    "Age": ["<40", "40-59", ">=60"],
+    "Education": ["No Matura", "(at least) Matura"],
+    "Freq_of_volunteering": ["none", "at least once a year", "at least once a week", "at least once a month"],
+}
+
+MOTIVATIONS = ["I enjoy the work.", "I want to contribute something useful to the common good.",
+               "I would like to help others.", "The activity helps me in my job.",
+               "I can contribute my skills and knowledge.", "I meet people and make friends.",
+               "I get social recognition.", "It keeps me physically and mentally active.",
+               "I can share my experience.", "I have the opportunity to learn and further my education.",
+               "I hope to find a job as a result.", "I would also like to receive help myself when I need it.",
+               "I want to get involved in an important cause."]
+BARRIERS = ["I have never been asked or requested.", "I never thought about it.",
+            "I am busy with tasks in the family.", "I feel unable to do so due to illness or disability.",
+            "I can't afford it financially.", "I can't reconcile it with my job.", "I have had bad experiences.",
+            "I have the feeling that I can't make a contribution.", "I'm not the right age.",
+            "I am not sufficiently informed about the possibilities.",
+            "There is no job in the neighbourhood that is interesting for me."]
+
+HOURS_RANGES = ["<1 hour", "1-4 hours", "5-9 hours", "10-19 hours", "20 hours or more"]
+
+# gender comparison: section -> (label column, labels)
+GENDER_SECTIONS = {
+    "Formal_NumberOfOrgs": ("num_orgs", ["1 Organisation", "2 Organisations", "3 Organisations",
+                                         "4 or more Organisations"]),
+    "Formal_TaskTypes": ("task", ["Leadership", "Core tasks", "Support tasks"]),
+    "Formal_Areas": ("area", FORMAL_ACTIVITIES),
+    "Informal_Areas": ("area", INFORMAL_ACTIVITIES),
+    "Formal_Time/week": ("hours_range/week", HOURS_RANGES),
+    "Informal_Time/week": ("hours_range/week", HOURS_RANGES),
+}
+
+# error bars: section -> categories ("Total" and "Region" are added separately)
+ERROR_BAR_SECTIONS = {
+    "Gender": ["Men", "Women"],
+    "Age": ["<40", "40-59", "60+"],
+    "Education": ["(max.) Compulsory education", "BMS", "Matura", "University"],
+    "MigrationBackground": ["Migration background", "No migration background"],
+    "Employment": ["Employed", "Retired", "Miscellaneous"],
+    "MunicipalitySize": ["≤2,500 inhabitants", "≤10,000 inhabitants", "≤100,000 inhabitants",
+                         ">100,000 inhabitants"],
+    "TaskType": ["Leadership", "Core tasks", "Support tasks"],
+}
+
+
+def survey_years(count):
+    # the four survey years, preceded by extra years three apart (1988..2003 for count=10)
+    if count <= len(SURVEY_YEARS):
+        return SURVEY_YEARS[-count:]
+    extra = count - len(SURVEY_YEARS)
+    return list(range(SURVEY_YEARS[0] - 3 * extra, SURVEY_YEARS[0], 3)) + SURVEY_YEARS
+
+
+def region_names(count):
+    if count == len(LAENDER):
+        return list(LAENDER)
+    return [f"District {i:0{len(str(count))}d}" for i in range(1, count + 1)]
+
+
+def scaled(labels, count, prefix):
+    # labels cut or padded with numbered synthetic labels; None keeps them as they are
+    if count is None:
+        return list(labels)
+    return list(labels[:count]) + [f"{prefix} {i}" for i in range(len(labels) + 1, count + 1)]
+
+
+def cross(*frames):
+    # cartesian product, first frame varying slowest
+    result = frames[0]
+    for frame in frames[1:]:
+        result = result.merge(frame, how="cross")
+    return result
+
+
+def column(name, values):
+    return pd.DataFrame({name: values})
+
+
+def pairs(mapping, key, value):
+    # {key: [values]} -> two-column frame with one row per value
+    keys = np.repeat(list(mapping), [len(v) for v in mapping.values()])
+    return pd.DataFrame({key: keys, value: [v for values in mapping.values() for v in values]})
+
+
+def hour_quantiles(rng, n):
+    # (q1, median, q3, mean) with q1 < median < q3 and a right-skewed mean
+    q1 = rng.uniform(0.3, 1.0, n)
+    median = q1 + rng.uniform(1.0, 2.5, n)
+    q3 = median + rng.uniform(2.0, 5.5, n)
+    mean = median + rng.uniform(1.0, 3.5, n)
+    return q1.round(2), median.round(2), q3.round(2), mean.round(2)
+
+
+def geo_table(rng, years, regions):
+    frame = cross(column("year", years), column("region", regions))
+    n = len(frame)
+    population = rng.integers(50, 1500, len(regions))
+    frame["total_pop"] = np.tile(population, len(years))
+    frame["perc_volunteers_from_pop"] = rng.uniform(38, 58, n).round(1)
+    frame["perc_formal_from_pop"] = (frame["perc_volunteers_from_pop"] * rng.uniform(0.45, 0.65, n)).round(1)
+    frame["perc_informal_from_pop"] = (frame["perc_volunteers_from_pop"] * rng.uniform(0.6, 0.8, n)).round(1)
+    frame["total_volunteers"] = (frame["total_pop"] * frame["perc_volunteers_from_pop"] / 100).round(1)
+    hours = {prefix: hour_quantiles(rng, n) for prefix in ("vlntrs", "formal", "informal")}
+    for prefix, (_, _, _, mean) in hours.items():
+        frame[f"avg_hours_{prefix}"] = mean
+    for prefix, (q1, median, q3, _) in hours.items():
+        frame[f"25_hrs_{prefix}"] = q1
+        frame[f"median_hours_{prefix}"] = median
+        frame[f"75_hrs_{prefix}"] = q3
+
+    # national rows: population-weighted means per year, placed before the regions
+    weights = frame["total_pop"]
+    values = frame.columns.drop(["year", "region", "total_pop", "total_volunteers"])
+    weighted = frame[values].mul(weights, axis=0).groupby(frame["year"]).sum()
+    national = weighted.div(weights.groupby(frame["year"]).sum(), axis=0).round(2).reset_index()
+    national["region"] = "Austria"
+    national["total_pop"] = frame.groupby("year")["total_pop"].sum().to_numpy()
+    national["total_volunteers"] = frame.groupby("year")["total_volunteers"].sum().round(1).to_numpy()
+    frame = pd.concat([national[frame.columns], frame], ignore_index=True)
+    return frame.sort_values("year", kind="stable", ignore_index=True)
+
+
+def trend_table(rng, years, demographics):
+    categories = pairs(demographics, "demographic", "category")
+    frame = cross(column("year", years), categories)
+    n, steps = len(frame), len(years)
+    # each (demographic, category) drifts linearly from its own starting level
+    series = len(categories)
+    start = np.tile(rng.uniform(25, 50, series), steps)
+    slope = np.tile(rng.uniform(-0.4, 0.8, series), steps)
+    position = np.repeat(np.arange(steps), series)
+    population = np.tile(rng.uniform(100, 4000, series), steps) * (1 + 0.01 * position)
+    any_perc = np.clip(start + slope * position + rng.normal(0, 1.0, n), 5, 95)
+    formal = any_perc * rng.uniform(0.45, 0.6, n)
+    informal = any_perc * rng.uniform(0.6, 0.75, n)
+    both = formal + informal - any_perc  # inclusion-exclusion keeps the shares consistent
+    percentages = {
+        "any": any_perc,
+        "formal": formal,
+        "informal": informal,
+        "both_formal_and_informal": both,
+        "formal_only": formal - both,
+        "informal_only": informal - both,
+    }
+    frame["population"] = population.round(1)
+    for vol_type in VOLUNTEER_TYPES:
+        perc = percentages[vol_type]
+        frame[f"{vol_type}_volunteer_count"] = (population * perc / 100).round(1)
+        frame[f"{vol_type}_volunteer_perc"] = perc.round(1)
+    return frame
+
+
+def motiv_barrier_table(rng, years, motivations, barriers):
+    statements = pairs({"motivation": motivations, "barrier": barriers}, "type", "category")
+    frame = cross(column("year", years[::-1]), column("gender", ["all", "men", "women"]), statements)
+    frame = frame[["year", "type", "gender", "category"]]
+    n = len(frame)
+    frame["population"] = rng.uniform(1500, 4000, n).round(1)
+    # four answer shares summing to 100
+    shares = rng.dirichlet([6, 4, 1.2, 0.8], n) * 100
+    frame["fully_agree"] = shares[:, 0].round(1)
+    frame["rather_agree"] = shares[:, 1].round(1)
+    frame["rather_disagree"] = shares[:, 2].round(1)
+    frame["not_at_all"] = (100 - frame[["fully_agree", "rather_agree", "rather_disagree"]].sum(axis=1)).round(1)
+    return frame
+
+
+def activity_table(rng, years, sections, activities):
+    activity_ids = pd.DataFrame({"id": np.arange(len(activities), dtype=float), "name": activities})
+    all_volunteers = rng.uniform(1800, 3200, len(years)).round(1)
+
+    # Total: one all_volunteers record, then one count per activity
+    totals = cross(column("year", years), activity_ids)
+    totals["count"] = (np.repeat(all_volunteers, len(activities))
+                       * rng.uniform(0.05, 0.35, len(totals))).round(1)
+    totals["section"] = "Total"
+    headers = pd.DataFrame({"year": years, "section": "Total", "all_volunteers": all_volunteers})
+
+    breakdown = cross(column("year", years), pairs(sections, "section", "category"), activity_ids)
+    breakdown["count"] = rng.uniform(20, 600, len(breakdown)).round(1)
+
+    # not sorted by year: grouping by year keeps the Total records ahead of the breakdown
+    frame = pd.concat([headers, totals, breakdown], ignore_index=True)
+    return frame[["year", "section", "all_volunteers", "id", "name", "count", "category"]]
+
+
+def gender_table(rng, years, sections):
+    parts = []
+    for section, (label_column, labels) in sections.items():
+        part = cross(column("year", years), column(label_column, labels))
+        part.insert(1, "section", section)
+        parts.append(part)
+    frame = pd.concat(parts, ignore_index=True)
+    n = len(frame)
+    men = rng.uniform(30, 800, n)
+    women = men * rng.uniform(0.5, 1.5, n)
+    frame["men_count"] = men.round(1)
+    frame["men_perc"] = (men / (men + women) * 100).round(1)
+    frame["women_count"] = women.round(1)
+    frame["women_perc"] = (100 - frame["men_perc"]).round(1)
+    return frame.sort_values("year", kind="stable", ignore_index=True)
+
+
+def error_bar_table(rng, years, sections):
+    frame = cross(column("year", years), pairs(sections, "section", "category_value"),
+                  column("volunteering_type", ["Total", "Formal", "Informal"]))
+    n = len(frame)
+    frame["persons_1000"] = rng.uniform(50, 3500, n).round(1)
+    q1, median, q3, mean = hour_quantiles(rng, n)
+    frame["avg_hours"] = mean
+    frame["percentile_25"] = q1
+    frame["percentile_50"] = median
+    frame["percentile_75"] = q3
+    return frame
+
+
+def grid_geojson(regions, bbox=AUSTRIA_BBOX):
+    # rectangular cells over bbox; neighbours share corner coordinates exactly
+    lon_min, lon_max, lat_min, lat_max = bbox
+    columns = math.ceil(math.sqrt(len(regions) * (lon_max - lon_min) / (lat_max - lat_min)))
+    rows = math.ceil(len(regions) / columns)
+    lons = np.linspace(lon_min, lon_max, columns + 1).round(6).tolist()
+    lats = np.linspace(lat_max, lat_min, rows + 1).round(6).tolist()
+    features = []
+    for index, name in enumerate(regions):
+        row, col = divmod(index, columns)
+        ring = [[lons[col], lats[row]], [lons[col + 1], lats[row]], [lons[col + 1], lats[row + 1]],
+                [lons[col], lats[row + 1]], [lons[col], lats[row]]]
+        features.append({
+            "type": "Feature",
+            "properties": {"name": name, "iso": str(index + 1)},
+            "geometry": {"type": "MultiPolygon", "coordinates": [[ring]]},
+        })
+    return {"type": "FeatureCollection", "name": "laender_999_geo", "features": features}
+
+
+def generate(seed=0, years=4, trend_years=10, regions=9, demographics=None, categories=None):
+    """Every dataset as a flat table (nested assets with 'year' and 'section' columns) plus the GeoJSON."""
+    rng = np.random.default_rng(seed)
+    years = survey_years(years)
+    regions = region_names(regions)
+
+    trend_demographics = {name: scaled(labels, categories, f"{name} group") if name != "total" else labels
+                          for name, labels in TREND_DEMOGRAPHICS.items()}
+    trend_demographics["region"] = regions
+    trend_demographics = {name: trend_demographics.get(name) or scaled([], categories or 4, f"{name} group")
+                          for name in scaled(list(trend_demographics), demographics, "demographic")}
+
+    def sections(base, prefix):
+        names = scaled(list(base), None if demographics is None else max(demographics - 1, 0), prefix)
+        return {name: scaled(base.get(name, []), categories, f"{name} group")
+                or scaled([], categories or 4, f"{name} group") for name in names}
+
+    activity_sections = sections(ACTIVITY_SECTIONS, "Section")
+    error_bar_sections = {"Total": ["All"]}
+    error_bar_sections.update(sections(ERROR_BAR_SECTIONS, "Section"))
+    error_bar_sections["Region"] = ["Austria"] + regions
+
+    gender_sections = {
+        section: (label_column, scaled(labels, categories, label_column))
+        for section, (label_column, labels) in GENDER_SECTIONS.items()
+    }
+
+    tables = {
+        "geo": geo_table(rng, years, regions),
+        "trend": trend_table(rng, survey_years(trend_years), trend_demographics),
+        "motiv_barrier": motiv_barrier_table(rng, years, scaled(MOTIVATIONS, categories, "Motivation"),
+                                             scaled(BARRIERS, categories, "Barrier")),
+        "activity_formal": activity_table(rng, years, activity_sections,
+                                          scaled(FORMAL_ACTIVITIES, categories, "Formal activity")),
+        "activity_informal": activity_table(rng, years, activity_sections,
+                                            scaled(INFORMAL_ACTIVITIES, categories, "Informal activity")),
+        "gender": gender_table(rng, years, gender_sections),
+        "error_bars": error_bar_table(rng, years, error_bar_sections),
+    }
+    return tables, grid_geojson(regions)
+
+
+def nested_json(frame):
+    # flat table -> {year: {section: [records]}}, leaving out the fields a record doesn't use
+    years = []
+    for year, by_year in frame.groupby("year", sort=True):
+        sections = []
+        for section, records in by_year.groupby("section", sort=False):
+            records = records.drop(columns=["year", "section"]).dropna(axis=1, how="all")
+            sections.append(f"{json.dumps(section, ensure_ascii=False)}:"
+                            f"{records.to_json(orient='records', force_ascii=False)}")
+        years.append(f'"{year}":{{{",".join(sections)}}}')
+    return "{" + ",".join(years) + "}"
+
+
+def write(tables, geojson, folder, extension=".json"):
+    os.makedirs(folder, exist_ok=True)
+    for name, frame in tables.items():
+        if extension == ".json":
+            path = asset_path(name, folder=folder)
+            if ASSETS[name][1]:
+                text = nested_json(frame)
+            else:
+                text = frame.to_json(orient="records", force_ascii=False)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            path = asset_path(name, extension, folder)
+            FORMATS[extension][1](to_columnar(frame), path)
+        yield name, path, len(frame)
+    with open(os.path.join(folder, "laender_999_geo.json"), "w", encoding="utf-8") as f:
+        json.dump(geojson, f, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", required=True, help="folder to write the assets to (use it as DATA_DIR)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--years", type=int, default=4, help="survey years (default 4: 2006-2022)")
+    parser.add_argument("--trend-years", type=int, default=10, help="years in the time series (default 10)")
+    parser.add_argument("--regions", type=int, default=9, help="regions; anything but 9 uses numbered districts")
+    parser.add_argument("--demographics", type=int, default=None,
+                        help="demographics / sections per breakdown (default: the real ones)")
+    parser.add_argument("--categories", type=int, default=None,
+                        help="categories per demographic and labels per list (default: the real ones)")
+    parser.add_argument("--format", choices=["json", "parquet", "feather"], default="json")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    tables, geojson = generate(args.seed, args.years, args.trend_years, args.regions,
+                               args.demographics, args.categories)
+    print(f"generated {sum(len(t) for t in tables.values())} rows in {time.perf_counter() - started:.2f}s")
+    started = time.perf_counter()
+    for name, path, rows in write(tables, geojson, args.output, "." + args.format):
+        print(f"{path}: {rows} rows")
+    print(f"written in {time.perf_counter() - started:.2f}s")
@@ -0,0 +1,146 @@
+"""Pre-rendered figures for every callback input combination.
+
+    python figure_bundle.py build --output figures.bundle
+
+Run it once per data release; with FIGURE_BUNDLE=figures.bundle the memoized
+callbacks serve figures from the bundle. Layout: magic, header length, a JSON
+header (metadata and {key: [offset, length, is_tuple]}), then one zlib blob
+per figure. The file is mmapped, so workers share its pages.
+"""
+import argparse
+import glob
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+import zlib
+
+from assets_io import ASSETS, DATA_DIR, asset_path, source_file
+from figure_cache import normalize
+
+MAGIC = b"VDFBND01"
+
+
+def bundle_key(name, args):
+    return json.dumps([name, normalize(args)], separators=(",", ":"), ensure_ascii=False)
+
+
+def assets_digest(folder=None):
+    # ties a bundle to the exact data it was rendered from: the file load_table() reads for
+    # each asset (a columnar copy when one is current) and the other JSON files (the geometry)
+    asset_jsons = {asset_path(name, folder=folder) for name in ASSETS}
+    paths = [source_file(name, folder) for name in ASSETS]
+    paths += [path for path in glob.glob(os.path.join(folder or DATA_DIR, "*.json")) if path not in asset_jsons]
+    digest = hashlib.sha1()
+    for path in sorted(paths):
+        if not os.path.exists(path):
+            continue
+        digest.update(os.path.basename(path).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def write_bundle(path, items, metadata=None, level=9):
+    # items: iterable of (key, figure_json, is_tuple); written to a temp file, then renamed
+    index = {}
+    blobs = []
+    offset = 0
+    for key, figure_json, is_tuple in items:
+        blob = zlib.compress(figure_json.encode("utf-8"), level)
+        index[key] = [offset, len(blob), int(is_tuple)]
+        blobs.append(blob)
+        offset += len(blob)
+    header = json.dumps({"metadata": metadata or {}, "index": index}, ensure_ascii=False).encode("utf-8")
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for blob in blobs:
+            f.write(blob)
+    os.replace(tmp_path, path)
+    return len(index)
+
+
+class FigureBundle:
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[:8] != MAGIC:
+            raise ValueError(f"{path} is not a figure bundle")
+        (header_len,) = struct.unpack("<Q", self._map[8:16])
+        header = json.loads(self._map[16:16 + header_len].decode("utf-8"))
+        self.metadata = header["metadata"]
+        self.index = header["index"]
+        self._data_start = 16 + header_len
+        self.hits = 0
+
+    def __len__(self):
+        return len(self.index)
+
+    def get(self, name, args):
+        entry = self.index.get(bundle_key(name, args))
+        if entry is None:
+            return None
+        start = self._data_start + entry[0]
+        self.hits += 1
+        value = json.loads(zlib.decompress(self._map[start:start + entry[1]]))
+        # JSON has no tuples: multi-figure results are stored as lists
+        return tuple(value) if entry[2:] == [1] else value
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+def open_bundle(path, assets_folder=None):
+    # Returns None (and says why) when the bundle is missing or was built from other data
+    if not path:
+        return None
+    if not os.path.exists(path):
+        print(f"FIGURE_BUNDLE {path} not found, rendering figures live", file=sys.stderr)
+        return None
+    bundle = FigureBundle(path)
+    if bundle.metadata.get("assets_digest") != assets_digest(assets_folder):
+        print(f"FIGURE_BUNDLE {path} was built from different assets, ignoring it", file=sys.stderr)
+        bundle.close()
+        return None
+    return bundle
+
+
+def build(output, only=None):
+    from plotly.io.json import to_json_plotly
+    import app
+
+    def items():
+        for name, grid in app.figure_input_grid().items():
+            if only and name not in only:
+                continue
+            func = app.figure_cache.functions[name]
+            started = time.perf_counter()
+            count = 0
+            for args in grid:
+                value = app.figure_cache.prepare(func(*args))
+                yield bundle_key(name, args), to_json_plotly(value), isinstance(value, tuple)
+                count += 1
+            print(f"{name}: {count} figures in {time.perf_counter() - started:.1f}s")
+
+    metadata = {"assets_digest": assets_digest(), "created": time.strftime("%Y-%m-%dT%H:%M:%S")}
+    count = write_bundle(output, items(), metadata)
+    print(f"wrote {count} figures to {output} ({os.path.getsize(output) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    sub = parser.add_subparsers(dest="command", required=True)
+    build_parser = sub.add_parser("build", help="render every figure into a bundle file")
+    build_parser.add_argument("--output", default="figures.bundle")
+    build_parser.add_argument("--only", nargs="*", help="callback names to include")
+    args = parser.parse_args()
+    build(args.output, args.only)
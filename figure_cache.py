@@ -0,0 +1,160 @@
+"""Memoized callback figures with LRU eviction inside a byte budget.
+
+Every chart callback is a pure function of a handful of dropdown values, so
+the rendered figure can be reused for any later request with the same inputs.
+Entries are stored as plain figure dicts and their size is measured once, as
+the length of the JSON Dash would send.
+"""
+import functools
+import threading
+from collections import OrderedDict
+
+from lazy_imports import LazyModule
+
+# imported on first use, not at startup (see lazy_imports.py)
+go = LazyModule("plotly.graph_objects")
+plotly_json = LazyModule("plotly.io.json")
+
+
+def normalize(value):
+    # Dash hands over lists for range sliders and may send 2022.0 for 2022;
+    # both must map to the same hashable key
+    if isinstance(value, (list, tuple)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, dict):
+        return tuple(sorted((k, normalize(v)) for k, v in value.items()))
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def to_plain(result):
+    # go.Figure objects are converted so cached entries are cheap to serve
+    if isinstance(result, go.Figure):
+        return result.to_dict()
+    if isinstance(result, tuple):
+        return tuple(to_plain(r) for r in result)
+    return result
+
+
+class FigureCache:
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries = OrderedDict()  # key -> (value, size)
+        self._lock = threading.Lock()
+        self.hits = {}
+        self.misses = {}
+        self.evictions = 0
+        # undecorated builders by callback name, used to pre-render bundles
+        self.functions = {}
+        # optional figure_bundle.FigureBundle consulted before rendering
+        self.bundle = None
+        # callback name -> number of reloads of its data; a build that started before one isn't cached
+        self.generations = {}
+        # optional function applied to every rendered figure dict (compression.minify_figure)
+        self.postprocess = None
+        # optional render_pool.RenderPool that builds the figures it names in worker processes
+        self.renderer = None
+
+    @property
+    def enabled(self):
+        return self.max_bytes > 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses[key[0]] = self.misses.get(key[0], 0) + 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits[key[0]] = self.hits.get(key[0], 0) + 1
+            return entry[0]
+
+    def put(self, key, value, size, generation=None):
+        # generation: generations[name] when the build started, None to store unconditionally
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if generation is not None and self.generations.get(key[0], 0) != generation:
+                return
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self, name=None):
+        # drop everything, or only the entries of one callback
+        with self._lock:
+            for key in [k for k in self._entries if name is None or k[0] == name]:
+                self.current_bytes -= self._entries.pop(key)[1]
+
+    def prepare(self, result):
+        # builder result -> what is cached and sent
+        result = to_plain(result)
+        return self.postprocess(result) if self.postprocess is not None else result
+
+    def render(self, name, func, args, key):
+        # prepared builder result, from the render pool when it handles this figure
+        if self.renderer is not None and name in self.renderer.names:
+            return self.renderer.render(name, args, key, lambda: self.prepare(func(*args)))
+        return self.prepare(func(*args))
+
+    def invalidate(self, name):
+        # data behind a callback was reloaded: drop its entries, and don't store figures
+        # whose build started before (they were made from the old data)
+        with self._lock:
+            self.generations[name] = self.generations.get(name, 0) + 1
+        self.clear(name)
+
+    def bundled(self, name, args):
+        # pre-rendered figure, or None when there is no bundle for the current assets
+        if self.bundle is None:
+            return None
+        return self.bundle.get(name, args)
+
+    def stats(self):
+        with self._lock:
+            names = sorted(set(self.hits) | set(self.misses))
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'evictions': self.evictions,
+                'bundle_hits': self.bundle.hits if self.bundle is not None else None,
+                'render_pool': self.renderer.stats() if self.renderer is not None else None,
+                'callbacks': {
+                    name: {'hits': self.hits.get(name, 0), 'misses': self.misses.get(name, 0)}
+                    for name in names
+                },
+            }
+
+    def memoize(self, name):
+        # Decorator for callback bodies; goes below @app.callback
+        def decorator(func):
+            self.functions[name] = func
+
+            @functools.wraps(func)
+            def wrapper(*args):
+                # bundle pages are shared between workers, no need to copy into the LRU
+                value = self.bundled(name, args)
+                if value is not None:
+                    return value
+                key = (name, normalize(args))
+                if not self.enabled:
+                    return self.render(name, func, args, key)
+                cached = self.get(key)
+                if cached is not None:
+                    return cached
+                generation = self.generations.get(name, 0)
+                value = self.render(name, func, args, key)
+                self.put(key, value, len(plotly_json.to_json_plotly(value)), generation)
+                return value
+            return wrapper
+        return decorator
@@ -0,0 +1,136 @@
+"""Region geometry for the choropleth, simplified once at startup.
+
+Shared borders are simplified once between pinned junction vertices, so
+neighbouring regions keep identical edges. The GeoJSON is served from a
+cacheable route and map figures only reference its URL.
+"""
+import hashlib
+import json
+
+
+def _perpendicular_distance(point, start, end):
+    (x, y), (x1, y1), (x2, y2) = point, start, end
+    dx, dy = x2 - x1, y2 - y1
+    if dx == 0 and dy == 0:
+        return ((x - x1) ** 2 + (y - y1) ** 2) ** 0.5
+    return abs(dy * x - dx * y + x2 * y1 - y2 * x1) / (dx * dx + dy * dy) ** 0.5
+
+
+def douglas_peucker(points, tolerance):
+    # iterative, keeps both end points
+    if len(points) < 3 or tolerance <= 0:
+        return list(points)
+    keep = [False] * len(points)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(points) - 1)]
+    while stack:
+        first, last = stack.pop()
+        max_distance, index = 0.0, None
+        for i in range(first + 1, last):
+            distance = _perpendicular_distance(points[i], points[first], points[last])
+            if distance > max_distance:
+                max_distance, index = distance, i
+        if index is not None and max_distance > tolerance:
+            keep[index] = True
+            stack.append((first, index))
+            stack.append((index, last))
+    return [p for p, k in zip(points, keep) if k]
+
+
+def _rings(geometry):
+    if geometry['type'] == 'Polygon':
+        return [geometry['coordinates']]
+    return geometry['coordinates']  # MultiPolygon
+
+
+def _edge(p, q):
+    return (p, q) if p <= q else (q, p)
+
+
+def _simplify_ring(ring, owners, tolerance):
+    # ring is closed (first == last); split it at pinned vertices and simplify each run
+    points = [tuple(p) for p in ring[:-1]]
+    n = len(points)
+    if n < 4:
+        return ring
+    pinned = []
+    for i, p in enumerate(points):
+        before = owners[_edge(points[i - 1], p)]
+        after = owners[_edge(p, points[(i + 1) % n])]
+        pinned.append(before != after or owners[p] != before)
+    if not any(pinned):
+        # fully shared ring (an enclave and its hole): anchor both on the same vertex
+        pinned[points.index(min(points))] = True
+    # rotate so the ring starts on a pinned vertex
+    start = pinned.index(True)
+    points = points[start:] + points[:start]
+    pinned = pinned[start:] + pinned[:start]
+    anchors = [i for i, flag in enumerate(pinned) if flag] + [n]
+    points.append(points[0])
+
+    result = []
+    for a, b in zip(anchors, anchors[1:]):
+        run = points[a:b + 1]
+        # simplify in a canonical direction so both neighbours get the same edge
+        if run[::-1] < run:
+            simplified = douglas_peucker(run[::-1], tolerance)[::-1]
+        else:
+            simplified = douglas_peucker(run, tolerance)
+        result.extend(simplified[:-1])
+    result.append(result[0])
+    if len(result) < 4:
+        return ring
+    return [list(p) for p in result]
+
+
+def simplify_geojson(geojson, tolerance, precision=None):
+    # edge or vertex -> set of feature indexes whose boundary uses it
+    owners = {}
+    for index, feature in enumerate(geojson['features']):
+        for polygon in _rings(feature['geometry']):
+            for ring in polygon:
+                for p, q in zip(ring, ring[1:]):
+                    owners.setdefault(_edge(tuple(p), tuple(q)), set()).add(index)
+                    owners.setdefault(tuple(p), set()).add(index)
+    owners = {edge: frozenset(indexes) for edge, indexes in owners.items()}
+
+    features = []
+    for feature in geojson['features']:
+        polygons = []
+        for polygon in _rings(feature['geometry']):
+            rings = [_simplify_ring(ring, owners, tolerance) for ring in polygon]
+            if precision is not None:
+                rings = [[[round(x, precision), round(y, precision)] for x, y in ring] for ring in rings]
+            polygons.append(rings)
+        geometry = {'type': 'MultiPolygon', 'coordinates': polygons}
+        features.append({'type': 'Feature', 'properties': feature['properties'], 'geometry': geometry})
+    return {'type': 'FeatureCollection', 'features': features}
+
+
+def bounding_box(feature):
+    # (lon_min, lon_max, lat_min, lat_max) over every polygon, outer rings only
+    lons = [p[0] for polygon in _rings(feature['geometry']) for p in polygon[0]]
+    lats = [p[1] for polygon in _rings(feature['geometry']) for p in polygon[0]]
+    return min(lons), max(lons), min(lats), max(lats)
+
+
+class RegionGeometry:
+
+    def __init__(self, geojson, tolerance=0.0, precision=None, name_key='name'):
+        if tolerance > 0 or precision is not None:
+            geojson = simplify_geojson(geojson, tolerance, precision)
+        self.geojson = geojson
+        self.bboxes = {
+            feature['properties'][name_key]: bounding_box(feature)
+            for feature in geojson['features']
+        }
+        self.json_bytes = json.dumps(geojson, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+        self.etag = hashlib.sha1(self.json_bytes).hexdigest()
+
+    @classmethod
+    def from_file(cls, path, tolerance=0.0, precision=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(json.load(f), tolerance, precision)
+
+    def bbox(self, region):
+        return self.bboxes.get(region)
@@ -0,0 +1,20 @@
+"""Gunicorn settings: load the datasets once in the master, then fork.
+
+    gunicorn -c gunicorn.conf.py
+"""
+import gc
+import multiprocessing
+import os
+
+wsgi_app = "app:create_server(preload=True)"
+preload_app = True
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8080')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 2))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 60))
+
+
+def post_fork(server, worker):
+    # the master disabled gc while loading; objects created in the worker are collected normally
+    gc.enable()
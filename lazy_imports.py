@@ -0,0 +1,46 @@
+"""Modules that are imported the first time one of their attributes is used.
+
+    pd = LazyModule("pandas")
+
+keeps pandas, NumPy and Plotly out of a worker's cold start until a dataset or
+figure needs them (see benchmarks/bench_startup.py).
+"""
+import importlib.util
+import sys
+import threading
+
+
+class LazyModule:
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        module = self._module
+        if module is None:
+            with self._lock:
+                # another thread may have imported it while we waited
+                if self._module is None:
+                    # __import__ rather than importlib.import_module so -X importtime reports it
+                    __import__(self._name)
+                    self._module = sys.modules[self._name]
+                module = self._module
+        return module
+
+    def __getattr__(self, attribute):
+        # only called for names not set in __init__
+        return getattr(self._load(), attribute)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+def available(name):
+    # whether an optional module is installed, without importing it
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
@@ -0,0 +1,195 @@
+"""Per-callback latency, payload-size and cache metrics in Prometheus text format.
+
+Callbacks are wrapped with @callback_metrics.instrument(name) below
+@app.callback; mark(phase) splits a callback's time into phases. Each gunicorn
+worker keeps its own metrics.
+"""
+import bisect
+import functools
+import json
+import threading
+import time
+
+from dash import ctx
+from dash.exceptions import MissingCallbackContextException, PreventUpdate
+from flask import g, has_request_context
+
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def lines(self, metric, labels):
+        cumulative = 0
+        for bound, count in zip(list(self.buckets) + ["+Inf"], self.counts):
+            cumulative += count
+            yield f"{metric}_bucket{_labels(labels, le=bound)} {cumulative}"
+        yield f"{metric}_sum{_labels(labels)} {self.sum}"
+        yield f"{metric}_count{_labels(labels)} {self.count}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(labels, **extra):
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def _trigger():
+    # component id that fired the callback, "initial" on page load, "none" outside Dash
+    try:
+        triggered = ctx.triggered_id
+    except (MissingCallbackContextException, LookupError):
+        # LookupError: a thread started outside Dash has no callback context at all
+        return "none"
+    if triggered is None:
+        return "initial"
+    if isinstance(triggered, dict):
+        return json.dumps(triggered, sort_keys=True, separators=(",", ":"))
+    return triggered
+
+
+class CallbackMetrics:
+
+    # metric name -> (type, help)
+    METRICS = {
+        "dash_callback_duration_seconds": ("histogram", "Callback wall time by trigger."),
+        "dash_callback_phase_seconds": ("histogram", "Callback wall time by phase."),
+        "dash_callback_response_bytes": ("histogram", "Serialized callback response size."),
+        "dash_callback_errors_total": ("counter", "Callbacks that raised an exception."),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        # metric name -> {label tuple: Histogram or count}
+        self._series = {name: {} for name in self.METRICS}
+
+    def _observe(self, metric, labels, value, buckets):
+        with self._lock:
+            series = self._series[metric]
+            histogram = series.get(labels)
+            if histogram is None:
+                histogram = series[labels] = Histogram(buckets)
+            histogram.observe(value)
+
+    def _increment(self, metric, labels):
+        with self._lock:
+            series = self._series[metric]
+            series[labels] = series.get(labels, 0) + 1
+
+    def instrument(self, name):
+        # Decorator for callbacks; goes directly below @app.callback
+        def decorator(func):
+
+            @functools.wraps(func)
+            def wrapper(*args):
+                outer = getattr(self._local, "phases", None)
+                self._local.phases = phases = []
+                started = self._local.last_mark = time.perf_counter()
+                try:
+                    return func(*args)
+                except PreventUpdate:
+                    raise
+                except Exception:
+                    self._increment("dash_callback_errors_total", (("callback", name),))
+                    raise
+                finally:
+                    elapsed = time.perf_counter() - started
+                    self._local.phases = outer
+                    self._observe("dash_callback_duration_seconds",
+                                  (("callback", name), ("trigger", _trigger())), elapsed, SECONDS_BUCKETS)
+                    for phase, seconds in phases:
+                        self._observe("dash_callback_phase_seconds",
+                                      (("callback", name), ("phase", phase)), seconds, SECONDS_BUCKETS)
+                    if has_request_context():
+                        # response size is measured in observe_response once Dash has serialized it
+                        g.dash_callback_name = name
+            return wrapper
+        return decorator
+
+    def mark(self, phase):
+        # time since the previous mark goes to phase; no-op outside an instrumented callback
+        phases = getattr(self._local, "phases", None)
+        if phases is None:
+            return
+        now = time.perf_counter()
+        phases.append((phase, now - self._local.last_mark))
+        self._local.last_mark = now
+
+    def observe_response(self, response):
+        # Flask after_request hook
+        name = g.pop("dash_callback_name", None)
+        if name is not None and not response.direct_passthrough:
+            self._observe("dash_callback_response_bytes", (("callback", name),),
+                          len(response.get_data()), BYTES_BUCKETS)
+        return response
+
+    def render(self, cache_stats=None, dataset_stats=None):
+        lines = []
+        with self._lock:
+            for metric, (kind, help_text) in self.METRICS.items():
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} {kind}")
+                for labels, value in sorted(self._series[metric].items()):
+                    if kind == "histogram":
+                        lines.extend(value.lines(metric, labels))
+                    else:
+                        lines.append(f"{metric}{_labels(labels)} {value}")
+        if cache_stats is not None:
+            lines.extend(cache_lines(cache_stats))
+        if dataset_stats is not None:
+            lines.extend(dataset_lines(dataset_stats))
+        return "\n".join(lines) + "\n"
+
+
+def cache_lines(stats):
+    # FigureCache.stats() as Prometheus series
+    yield "# HELP figure_cache_requests_total Memoized figure lookups by result."
+    yield "# TYPE figure_cache_requests_total counter"
+    for name, counts in stats["callbacks"].items():
+        yield f"figure_cache_requests_total{_labels((('callback', name), ('result', 'hit')))} {counts['hits']}"
+        yield f"figure_cache_requests_total{_labels((('callback', name), ('result', 'miss')))} {counts['misses']}"
+    yield "# TYPE figure_cache_evictions_total counter"
+    yield f"figure_cache_evictions_total {stats['evictions']}"
+    yield "# TYPE figure_cache_entries gauge"
+    yield f"figure_cache_entries {stats['entries']}"
+    yield "# TYPE figure_cache_bytes gauge"
+    yield f"figure_cache_bytes {stats['bytes']}"
+    yield "# TYPE figure_cache_max_bytes gauge"
+    yield f"figure_cache_max_bytes {stats['max_bytes']}"
+    if stats["bundle_hits"] is not None:
+        yield "# TYPE figure_bundle_hits_total counter"
+        yield f"figure_bundle_hits_total {stats['bundle_hits']}"
+    if stats.get("render_pool") is not None:
+        yield "# HELP render_pool_figures_total Figure-cache misses by how the render pool handled them."
+        yield "# TYPE render_pool_figures_total counter"
+        for result in ('pooled', 'coalesced', 'inline', 'timeouts', 'failures'):
+            yield f"render_pool_figures_total{_labels((('result', result),))} {stats['render_pool'][result]}"
+        yield "# TYPE render_pool_pending gauge"
+        yield f"render_pool_pending {stats['render_pool']['pending']}"
+
+
+def dataset_lines(stats):
+    # DatasetRegistry.stats() as Prometheus series
+    yield "# HELP dataset_load_seconds Time spent loading each dataset (absent until loaded)."
+    yield "# TYPE dataset_load_seconds gauge"
+    for name, dataset in stats.items():
+        if dataset["load_seconds"] is not None:
+            yield f"dataset_load_seconds{_labels((('dataset', name),))} {dataset['load_seconds']}"
@@ -0,0 +1,111 @@
+"""Cold figures built in worker processes, for bursts of cache misses.
+
+With RENDER_PROCESSES=<n>, misses of the RENDER_POOL_FIGURES cards are built
+by n forkserver processes. Identical requests wait for the same build; beyond
+RENDER_QUEUE pending builds, or after RENDER_TIMEOUT seconds, a request builds
+its figure itself. The processes are replaced when their data is reloaded.
+"""
+import concurrent.futures
+import multiprocessing
+import os
+import threading
+from concurrent.futures.process import BrokenProcessPool
+
+
+class RenderPool:
+
+    def __init__(self, target, processes, names, max_pending=None, timeout=10.0, initializer=None):
+        # target(name, args) -> prepared figure and initializer() run in the worker processes,
+        # so both must be module-level functions
+        self.target = target
+        self.processes = processes
+        self.names = set(names)
+        self.max_pending = max_pending if max_pending is not None else 4 * processes
+        self.timeout = timeout
+        self.initializer = initializer
+        self._executor = None
+        self._inflight = {}  # cache key -> Future of the build in progress
+        self._lock = threading.Lock()
+        self.pooled = 0
+        self.coalesced = 0
+        self.inline = 0
+        self.timeouts = 0
+        self.failures = 0
+
+    def _pool(self):
+        # caller holds the lock
+        if self._executor is None:
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context("forkserver"),
+                initializer=self.initializer,
+            )
+        return self._executor
+
+    def start(self):
+        # starts every worker process, so the first burst doesn't wait for their imports
+        with self._lock:
+            if self._executor is not None:
+                return
+            pool = self._pool()
+        for _ in range(self.processes):
+            pool.submit(os.getpid)
+
+    def restart(self):
+        # the data behind the pooled figures changed: the next render starts fresh processes
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._inflight.clear()
+        if executor is not None:
+            # builds already queued are cancelled, their waiters build the figure themselves
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _finished(self, key, future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def render(self, name, args, key, fallback):
+        # figure for one cache miss; fallback() builds it in the calling thread
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is not None:
+                self.coalesced += 1
+            elif len(self._inflight) < self.max_pending:
+                try:
+                    future = self._pool().submit(self.target, name, args)
+                except (BrokenProcessPool, RuntimeError):
+                    # a worker died; drop the pool, the next miss starts a new one
+                    self._executor = None
+                else:
+                    self._inflight[key] = future
+                    self.pooled += 1
+        if future is None:
+            self.inline += 1
+            return fallback()
+        future.add_done_callback(lambda done: self._finished(key, done))
+        try:
+            return future.result(timeout=self.timeout)
+        except concurrent.futures.TimeoutError:
+            self.timeouts += 1
+        except BrokenProcessPool:
+            self.failures += 1
+            with self._lock:
+                if self._executor is not None and self._inflight.get(key) is future:
+                    self._executor = None
+        except Exception:  # noqa: BLE001 - rebuilt here, so a real error surfaces in the callback
+            self.failures += 1
+        return fallback()
+
+    def stats(self):
+        with self._lock:
+            pending = len(self._inflight)
+        return {
+            'processes': self.processes,
+            'pending': pending,
+            'pooled': self.pooled,
+            'coalesced': self.coalesced,
+            'inline': self.inline,
+            'timeouts': self.timeouts,
+            'failures': self.failures,
+        }
@@ -0,0 +1,83 @@
+import pandas as pd
+import pytest
+from flask import Flask
+from werkzeug.datastructures import MultiDict
+
+import export
+from export import Exporter, _filter, csv_chunks
+
+
+def frame():
+    return pd.DataFrame({
+        'year': [2012, 2016, 2022, 2022],
+        'vol_type': ['Formal', 'Formal', 'Informal', 'Formal'],
+        'value': [1, 2, 3, 4],
+    })
+
+
+def test_filter_by_column_values():
+    rows = _filter(frame(), MultiDict([('vol_type', 'Formal'), ('format', 'csv')]))
+    assert list(rows['value']) == [1, 2, 4]
+    rows = _filter(frame(), MultiDict([('value', '1'), ('value', '3')]))
+    assert list(rows['value']) == [1, 3]
+
+
+def test_filter_by_year_range():
+    rows = _filter(frame(), MultiDict([('year_from', '2016'), ('year_to', '2022'), ('vol_type', 'Formal')]))
+    assert list(rows['year']) == [2016, 2022]
+
+
+def test_filter_rejects_unknown_columns_and_bad_numbers():
+    with pytest.raises(ValueError):
+        _filter(frame(), MultiDict([('region', 'Wien')]))
+    with pytest.raises(ValueError):
+        _filter(frame(), MultiDict([('value', 'many')]))
+    with pytest.raises(ValueError):
+        _filter(frame(), MultiDict([('year_from', 'soon')]))
+
+
+def test_csv_chunks_join_to_the_whole_table():
+    data = frame()
+    assert "".join(csv_chunks(data, 3)) == data.to_csv(index=False)
+    assert "".join(csv_chunks(data.iloc[:0], 3)) == data.iloc[:0].to_csv(index=False)
+
+
+@pytest.fixture
+def client():
+    def render(name, args):
+        raise KeyError(name)
+
+    server = Flask(__name__)
+    exporter = Exporter(render, chunk_rows=2)
+    exporter.register('activity', frame)
+    exporter.init_app(server)
+    return server.test_client()
+
+
+def test_export_streams_the_filtered_csv(client):
+    response = client.get('/export/activity?vol_type=Informal')
+    assert response.status_code == 200
+    assert response.mimetype == 'text/csv'
+    assert response.get_data(as_text=True) == frame().iloc[[2]].to_csv(index=False)
+
+
+def test_export_errors(client):
+    assert client.get('/export/nothing').status_code == 404
+    assert client.get('/export/activity?region=Wien').status_code == 400
+    assert client.get('/export/activity?format=xlsx').status_code == 400
+    assert client.get('/export/images/unknown').status_code == 404
+
+
+@pytest.mark.parametrize('scale', ['big', None, 0, -1, float('nan'), export.MAX_IMAGE_SCALE + 1])
+def test_image_export_rejects_a_bad_scale(client, monkeypatch, scale):
+    monkeypatch.setattr(export, 'available', lambda name: True)
+    views = [{'figure': 'chart', 'args': [2022]}]
+    response = client.post('/export/images', json={'views': views, 'scale': scale})
+    assert response.status_code == 400
+
+
+def test_image_export_validates_the_views(client, monkeypatch):
+    monkeypatch.setattr(export, 'available', lambda name: True)
+    assert client.post('/export/images', json={'views': []}).status_code == 400
+    assert client.post('/export/images', json={'views': [{'args': []}]}).status_code == 400
+    assert client.post('/export/images', json={'views': [{'figure': 'chart'}], 'format': 'bmp'}).status_code == 400
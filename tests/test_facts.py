@@ -0,0 +1,119 @@
+import numpy as np
+import pytest
+
+from assets_io import apply_schema, flatten_nested
+from facts import FactTable
+
+
+def activity(scale):
+    return apply_schema("activity_formal", flatten_nested({
+        "2022": {
+            "Total": [{"all_volunteers": 100 * scale}],
+            "Gender": [
+                {"id": 1, "name": "Sports", "category": "Men", "count": 10 * scale},
+                {"id": 1, "name": "Sports", "category": "Women", "count": 20 * scale},
+                {"id": 2, "name": "Culture", "category": "Men", "count": 30 * scale},
+                {"id": 2, "name": "Culture", "category": "Women", "count": None},
+            ],
+        },
+        "2016": {"Total": [{"all_volunteers": 90 * scale}]},
+    }))
+
+
+@pytest.fixture(scope="module")
+def facts():
+    gender = apply_schema("gender", flatten_nested({
+        "2022": {
+            "Formal_Areas": [
+                {"area": "Sports", "men_count": 5, "women_count": 6, "men_perc": 50.0, "women_perc": 60.0},
+                {"area": "Culture", "men_count": 7, "women_count": 8, "men_perc": 70.0, "women_perc": 80.0},
+            ],
+            "Informal_Time/week": [
+                {"hours_range/week": "1-5", "men_count": 1, "women_count": 2, "men_perc": 10.0, "women_perc": 20.0},
+            ],
+        },
+    }))
+    error_bars = apply_schema("error_bars", flatten_nested({
+        "2022": {
+            "Age": [
+                {"category_value": "15-29", "volunteering_type": "Formal", "persons_1000": 300.0,
+                 "avg_hours": 4.5, "percentile_25": 1.0, "percentile_50": 3.0, "percentile_75": 6.0},
+                {"category_value": "30-59", "volunteering_type": "Formal", "persons_1000": 500.0,
+                 "avg_hours": 3.5, "percentile_25": 1.0, "percentile_50": 2.0, "percentile_75": 5.0},
+            ],
+        },
+    }))
+    return FactTable.from_tables({
+        "activity_formal": activity(1),
+        "activity_informal": activity(2),
+        "gender": gender,
+        "error_bars": error_bars,
+    })
+
+
+def test_query_slice_keeps_record_order_and_drops_missing_values(facts):
+    rows = facts.query("activity", "count", 2022, "Formal", "Gender")
+    assert list(rows["category"].astype(str)) == ["Sports", "Sports", "Culture"]
+    assert list(rows["group"].astype(str)) == ["Men", "Women", "Men"]
+    assert list(rows["value"]) == [10, 20, 30]
+
+
+def test_query_separates_vol_types_years_and_measures(facts):
+    assert list(facts.query("activity", "count", 2022, "informal", "Gender")["value"]) == [20, 40, 60]
+    assert list(facts.query("activity", "all_volunteers", 2016, "formal", "Total")["value"]) == [90]
+    assert facts.query("activity", "perc", 2022, "formal", "Gender").empty
+    assert facts.query("activity", "count", 2012, "formal", "Gender").empty
+    assert facts.query("activity", "count", "not a year", "formal", "Gender").empty
+
+
+def test_query_by_category(facts):
+    rows = facts.query("gender", "perc", 2022, "formal", "Areas", category="Culture")
+    assert dict(zip(rows["group"].astype(str), rows["value"])) == {"Men": 70.0, "Women": 80.0}
+    assert facts.query("gender", "perc", 2022, "formal", "Areas", category="Nothing").empty
+
+
+def test_bulk_query_matches_slice_query(facts):
+    sliced = facts.query("error_bars", "avg_hours", 2022, "formal", "Age")
+    bulk = facts.query("error_bars", measure="avg_hours")
+    assert list(bulk["value"]) == list(sliced["value"]) == [4.5, 3.5]
+    assert len(facts.query("error_bars")) == 10
+    assert len(facts.query("gender", vol_type="Informal")) == 4
+    assert facts.query("gender", dimension="Nothing").empty
+    assert facts.query("nothing").empty
+
+
+def test_wide_restores_one_column_per_measure(facts):
+    wide = facts.wide("error_bars", 2022, "Formal", "Age", ["persons_1000", "percentile_50", "missing"])
+    assert list(wide["category"]) == ["15-29", "30-59"]
+    assert list(wide["persons_1000"]) == [300.0, 500.0]
+    assert list(wide["percentile_50"]) == [3.0, 2.0]
+    assert np.isnan(wide["missing"]).all()
+    assert facts.wide("error_bars", 2016, "Formal", "Age", ["avg_hours"]) is None
+
+
+def test_gender_sections_are_split_into_vol_type_and_dimension(facts):
+    rows = facts.query("gender", "count", 2022, "informal", "Time/week")
+    assert list(rows["category"].astype(str)) == ["1-5", "1-5"]
+    assert facts.label("gender", "Areas") == "area"
+    assert facts.label("gender", "Time/week") == "hours_range/week"
+    assert facts.label("activity", "Gender") == "name"
+    assert facts.label("nothing", "Gender") == "category"
+
+
+def test_dimension_table_lists_categories_in_record_order(facts):
+    dimensions = facts.dimensions.set_index(["source", "dimension"])
+    assert dimensions.loc[("activity", "Gender"), "categories"] == ["Sports", "Culture"]
+    assert dimensions.loc[("gender", "Areas"), "categories"] == ["Sports", "Culture"]
+    assert dimensions.loc[("error_bars", "Age"), "label"] == "category_value"
+
+
+def test_has_year(facts):
+    assert facts.has_year("activity", 2016, "Formal")
+    assert not facts.has_year("gender", 2016, "formal")
+    assert not facts.has_year("activity", None, "formal")
+
+
+def test_text_columns_are_categorical(facts):
+    for column in ("source", "vol_type", "dimension", "category", "group", "measure"):
+        assert facts.frame[column].dtype == "category"
+    assert facts.frame["year"].dtype == np.int16
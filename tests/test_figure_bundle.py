@@ -0,0 +1,91 @@
+import json
+import os
+
+import pytest
+
+from assets_io import ASSETS, asset_path
+from figure_bundle import FigureBundle, assets_digest, bundle_key, open_bundle, write_bundle
+
+
+@pytest.fixture
+def assets(tmp_path):
+    # one small file per asset plus the geometry; their contents only matter for the digest
+    for name in ASSETS:
+        with open(asset_path(name, folder=str(tmp_path)), "w") as f:
+            json.dump({"asset": name}, f)
+    (tmp_path / "laender_999_geo.json").write_text('{"type": "FeatureCollection", "features": []}')
+    return str(tmp_path)
+
+
+def build(path, folder, items):
+    return write_bundle(str(path), items, {"assets_digest": assets_digest(folder)})
+
+
+def test_bundle_round_trip(tmp_path, assets):
+    one = {"data": [{"type": "bar", "y": [1, 2]}], "layout": {}}
+    two = {"data": [], "layout": {"title": {"text": "map"}}}
+    count = build(tmp_path / "figures.bundle", assets, [
+        (bundle_key("chart", (2022, "Formal")), json.dumps(one), False),
+        (bundle_key("pair", ("Wien",)), json.dumps([one, two]), True),
+    ])
+    assert count == 2
+    bundle = FigureBundle(str(tmp_path / "figures.bundle"))
+    assert len(bundle) == 2
+    assert bundle.get("chart", [2022.0, "Formal"]) == one
+    assert bundle.get("pair", ("Wien",)) == (one, two)
+    assert bundle.get("chart", (2016, "Formal")) is None
+    assert bundle.hits == 2
+    bundle.close()
+
+
+def test_entries_without_a_tuple_flag_come_back_as_stored(tmp_path, assets):
+    path = tmp_path / "figures.bundle"
+    build(path, assets, [(bundle_key("pair", (1,)), "[1, 2]", False)])
+    assert FigureBundle(str(path)).get("pair", (1,)) == [1, 2]
+
+
+def test_not_a_bundle(tmp_path):
+    path = tmp_path / "figures.bundle"
+    path.write_bytes(b"NOTABUNDLE" * 4)
+    with pytest.raises(ValueError):
+        FigureBundle(str(path))
+
+
+def test_open_bundle_checks_the_assets_digest(tmp_path, assets):
+    path = tmp_path / "figures.bundle"
+    build(path, assets, [(bundle_key("chart", (1,)), "{}", False)])
+    assert open_bundle(str(path), assets) is not None
+    with open(asset_path("trend", folder=assets), "w") as f:
+        json.dump({"asset": "trend", "changed": True}, f)
+    assert open_bundle(str(path), assets) is None
+
+
+def test_open_bundle_without_a_file():
+    assert open_bundle(None) is None
+    assert open_bundle("/nonexistent/figures.bundle") is None
+
+
+def test_digest_ignores_mtimes_and_follows_the_file_the_loader_reads(assets):
+    before = assets_digest(assets)
+    json_path = asset_path("geo", folder=assets)
+    os.utime(json_path, (1, 1))
+    assert assets_digest(assets) == before
+
+    # a columnar copy at least as new as its JSON is what load_table() reads, so it is hashed
+    columnar = asset_path("geo", ".parquet", assets)
+    with open(columnar, "wb") as f:
+        f.write(b"columnar copy")
+    with_copy = assets_digest(assets)
+    assert with_copy != before
+
+    # once the JSON is newer again the copy is stale, and the JSON is hashed instead
+    os.utime(columnar, (1, 1))
+    os.utime(json_path, None)
+    assert assets_digest(assets) == before
+
+
+def test_digest_covers_the_geometry(assets):
+    before = assets_digest(assets)
+    with open(os.path.join(assets, "laender_999_geo.json"), "w") as f:
+        f.write('{"type": "FeatureCollection", "features": [1]}')
+    assert assets_digest(assets) != before
@@ -0,0 +1,158 @@
+from figure_cache import FigureCache, normalize
+
+
+def figure(label):
+    return {"data": [], "layout": {"title": {"text": label}}}
+
+
+def test_normalize_maps_equivalent_inputs_to_one_key():
+    assert normalize([2022.0, "a", [1, 2]]) == (2022, "a", (1, 2))
+    assert normalize({"b": 1, "a": [2.0]}) == (("a", (2,)), ("b", 1))
+    assert normalize(2.5) == 2.5
+
+
+def test_least_recently_used_entries_are_evicted_to_fit_the_budget():
+    cache = FigureCache(max_bytes=100)
+    cache.put(("f", (1,)), "one", 40)
+    cache.put(("f", (2,)), "two", 40)
+    assert cache.get(("f", (1,))) == "one"  # now the most recently used
+    cache.put(("f", (3,)), "three", 40)
+    assert cache.get(("f", (2,))) is None
+    assert cache.get(("f", (1,))) == "one"
+    assert cache.get(("f", (3,))) == "three"
+    assert cache.current_bytes == 80
+    assert cache.evictions == 1
+
+
+def test_entries_larger_than_the_budget_are_not_stored():
+    cache = FigureCache(max_bytes=100)
+    cache.put(("f", (1,)), "small", 10)
+    cache.put(("f", (2,)), "huge", 101)
+    assert cache.get(("f", (2,))) is None
+    assert cache.get(("f", (1,))) == "small"
+    assert cache.current_bytes == 10
+
+
+def test_replacing_an_entry_keeps_the_byte_count_right():
+    cache = FigureCache(max_bytes=100)
+    cache.put(("f", (1,)), "old", 30)
+    cache.put(("f", (1,)), "new", 50)
+    assert cache.get(("f", (1,))) == "new"
+    assert cache.current_bytes == 50
+
+
+def test_clear_drops_only_the_named_callback():
+    cache = FigureCache(max_bytes=100)
+    cache.put(("f", (1,)), "f", 10)
+    cache.put(("g", (1,)), "g", 20)
+    cache.clear("f")
+    assert cache.get(("f", (1,))) is None
+    assert cache.get(("g", (1,))) == "g"
+    assert cache.current_bytes == 20
+
+
+def test_memoize_builds_once_per_input():
+    cache = FigureCache(max_bytes=10 ** 6)
+    calls = []
+
+    @cache.memoize("chart")
+    def chart(year):
+        calls.append(year)
+        return figure(str(year))
+
+    assert chart(2022) == chart(2022.0) == figure("2022")
+    chart(2016)
+    assert calls == [2022, 2016]
+    assert cache.stats()["callbacks"]["chart"] == {"hits": 1, "misses": 2}
+    assert cache.functions["chart"](2012) == figure("2012")
+
+
+def test_invalidate_drops_entries_and_rebuilds():
+    cache = FigureCache(max_bytes=10 ** 6)
+    version = ["old"]
+
+    @cache.memoize("chart")
+    def chart(year):
+        return figure(version[0])
+
+    assert chart(2022) == figure("old")
+    version[0] = "new"
+    assert chart(2022) == figure("old")
+    cache.invalidate("chart")
+    assert chart(2022) == figure("new")
+
+
+def test_figure_built_while_its_data_was_reloaded_is_not_cached():
+    cache = FigureCache(max_bytes=10 ** 6)
+    calls = []
+
+    @cache.memoize("chart")
+    def chart(year):
+        calls.append(year)
+        if len(calls) == 1:
+            cache.invalidate("chart")  # a reload lands while the first build runs
+        return figure(str(len(calls)))
+
+    assert chart(2022) == figure("1")  # still returned to its caller
+    assert chart(2022) == figure("2")  # but built again for the next one
+    assert chart(2022) == figure("2")
+    assert len(calls) == 2
+
+
+def test_put_with_a_stale_generation_is_ignored():
+    cache = FigureCache(max_bytes=100)
+    generation = cache.generations.get("f", 0)
+    cache.invalidate("f")
+    cache.put(("f", (1,)), "stale", 10, generation)
+    assert cache.get(("f", (1,))) is None
+    cache.put(("f", (1,)), "fresh", 10, cache.generations["f"])
+    assert cache.get(("f", (1,))) == "fresh"
+
+
+def test_disabled_cache_builds_every_time():
+    cache = FigureCache(max_bytes=0)
+    calls = []
+
+    @cache.memoize("chart")
+    def chart(year):
+        calls.append(year)
+        return figure(str(year))
+
+    chart(2022)
+    chart(2022)
+    assert calls == [2022, 2022]
+    assert cache.stats()["entries"] == 0
+
+
+def test_bundle_is_consulted_before_building():
+    cache = FigureCache(max_bytes=10 ** 6)
+
+    class Bundle:
+        hits = 0
+
+        def get(self, name, args):
+            return figure("bundled") if args == (2022,) else None
+
+    cache.bundle = Bundle()
+
+    @cache.memoize("chart")
+    def chart(year):
+        return figure("built")
+
+    assert chart(2022) == figure("bundled")
+    assert chart(2016) == figure("built")
+    assert cache.stats()["entries"] == 1
+
+
+def test_postprocess_runs_once_on_built_figures():
+    cache = FigureCache(max_bytes=10 ** 6)
+    calls = []
+    cache.postprocess = lambda value: calls.append(value) or dict(value, minified=True)
+
+    @cache.memoize("chart")
+    def chart(year):
+        return figure(str(year))
+
+    assert chart(2022)["minified"]
+    assert chart(2022)["minified"]
+    assert len(calls) == 1
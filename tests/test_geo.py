@@ -0,0 +1,100 @@
+import math
+
+from geo import RegionGeometry, bounding_box, douglas_peucker, simplify_geojson
+
+
+def wavy_border(steps=40, amplitude=0.001):
+    # points from (1, 0) to (1, 1) that wiggle by less than the tolerance used below
+    inner = [[1 + amplitude * math.sin(i), i / steps] for i in range(1, steps)]
+    return [[1, 0]] + inner + [[1, 1]]
+
+
+def square(name, ring):
+    return {'type': 'Feature', 'properties': {'name': name}, 'geometry': {'type': 'Polygon', 'coordinates': [ring]}}
+
+
+def two_regions(border=None):
+    # west and east share the border from (1, 0) to (1, 1); each ring is closed
+    border = border or wavy_border()
+    west = [[0, 0]] + border + [[0, 1], [0, 0]]
+    east = border[::-1] + [[2, 0], [2, 1], border[-1]]
+    return {'type': 'FeatureCollection', 'features': [square('west', west), square('east', east)]}
+
+
+def edges(ring):
+    return {tuple(sorted((tuple(p), tuple(q)))) for p, q in zip(ring, ring[1:])}
+
+
+def outer_ring(feature):
+    return feature['geometry']['coordinates'][0][0]
+
+
+def test_douglas_peucker_keeps_end_points_and_drops_small_deviations():
+    points = [(0, 0), (1, 0.01), (2, -0.01), (3, 0)]
+    assert douglas_peucker(points, 0.1) == [(0, 0), (3, 0)]
+    assert douglas_peucker(points, 0.001) == points
+    assert douglas_peucker(points, 0) == points
+
+
+def test_shared_border_is_simplified_identically_for_both_regions():
+    simplified = simplify_geojson(two_regions(), tolerance=0.01)
+    west, east = (outer_ring(feature) for feature in simplified['features'])
+    # the border collapsed to its end points, and both regions use that same edge
+    assert edges(west) & edges(east) == {((1.0, 0.0), (1.0, 1.0))}
+    assert {tuple(p) for p in west} & {tuple(p) for p in east} == {(1.0, 0.0), (1.0, 1.0)}
+    assert len(west) == 5 and len(east) == 5
+
+
+def test_partly_simplified_border_has_the_same_vertices_on_both_sides():
+    simplified = simplify_geojson(two_regions(), tolerance=0.0005)
+    west, east = (outer_ring(feature) for feature in simplified['features'])
+    west_border = {tuple(p) for p in west if p[0] > 0.5}
+    east_border = {tuple(p) for p in east if p[0] < 1.5}
+    assert 2 < len(west_border) < len(wavy_border())
+    assert west_border == east_border
+    assert edges(west) & edges(east) == edges(sorted(west_border, key=lambda p: p[1]))
+
+
+def test_border_with_tied_distances_is_simplified_in_one_direction():
+    # both bulges are equally far from the chord: simplified from opposite ends, Douglas-Peucker
+    # would keep a different one for each region and leave a gap between them
+    border = [[1, 0], [1.1, 0.4], [1.1, 0.6], [1, 1]]
+    simplified = simplify_geojson(two_regions(border), tolerance=0.05)
+    west, east = (outer_ring(feature) for feature in simplified['features'])
+    west_border = {tuple(p) for p in west if p[0] > 0.5}
+    east_border = {tuple(p) for p in east if p[0] < 1.5}
+    assert len(west_border) == 3
+    assert west_border == east_border
+
+
+def test_junction_vertices_are_kept():
+    simplified = simplify_geojson(two_regions(), tolerance=10)
+    for feature in simplified['features']:
+        ring = outer_ring(feature)
+        assert ring[0] == ring[-1]
+        assert len(ring) >= 4
+        assert {(1.0, 0.0), (1.0, 1.0)} <= {tuple(p) for p in ring}
+
+
+def test_precision_rounds_coordinates():
+    simplified = simplify_geojson(two_regions(), tolerance=0.0001, precision=2)
+    for feature in simplified['features']:
+        for x, y in outer_ring(feature):
+            assert round(x, 2) == x and round(y, 2) == y
+
+
+def test_region_geometry_bounding_boxes_and_etag():
+    geometry = RegionGeometry(two_regions(), tolerance=0.01)
+    assert geometry.bbox('west') == (0, 1.0, 0, 1)
+    assert geometry.bbox('east') == (1.0, 2, 0, 1.0)
+    assert geometry.bbox('nowhere') is None
+    assert geometry.etag == RegionGeometry(two_regions(), tolerance=0.01).etag
+    assert geometry.etag != RegionGeometry(two_regions()).etag
+
+
+def test_bounding_box_covers_every_polygon():
+    feature = {'geometry': {'type': 'MultiPolygon', 'coordinates': [
+        [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+        [[[5, 5], [6, 5], [6, 7], [5, 5]]],
+    ]}}
+    assert bounding_box(feature) == (0, 6, 0, 7)
@@ -0,0 +1,89 @@
+import operator
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from render_pool import RenderPool
+
+
+def thread_pool(target, **kwargs):
+    # the pool's bookkeeping with threads standing in for the worker processes
+    pool = RenderPool(target, 2, ["chart"], **kwargs)
+    pool._executor = ThreadPoolExecutor(max_workers=2)
+    return pool
+
+
+def test_identical_requests_share_one_build():
+    started, release = threading.Event(), threading.Event()
+    builds = []
+
+    def target(name, args):
+        builds.append(args)
+        started.set()
+        release.wait(5)
+        return {"figure": args}
+
+    pool = thread_pool(target)
+    results = []
+    first = threading.Thread(target=lambda: results.append(pool.render("chart", (1,), "key", lambda: "inline")))
+    first.start()
+    started.wait(5)
+    second = threading.Thread(target=lambda: results.append(pool.render("chart", (1,), "key", lambda: "inline")))
+    second.start()
+    while pool.stats()["coalesced"] == 0:
+        second.join(0.01)
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert results == [{"figure": (1,)}, {"figure": (1,)}]
+    assert builds == [(1,)]
+    assert pool.stats()["pooled"] == 1 and pool.stats()["coalesced"] == 1
+    assert pool.stats()["pending"] == 0
+
+
+def test_requests_beyond_the_queue_build_inline():
+    release = threading.Event()
+    pool = thread_pool(lambda name, args: release.wait(5), max_pending=1)
+    waiting = threading.Thread(target=pool.render, args=("chart", (1,), "one", lambda: "inline"))
+    waiting.start()
+    while pool.stats()["pending"] == 0:
+        waiting.join(0.01)
+    assert pool.render("chart", (2,), "two", lambda: "inline") == "inline"
+    assert pool.stats()["inline"] == 1
+    release.set()
+    waiting.join(5)
+
+
+def test_timeout_falls_back_to_an_inline_build():
+    release = threading.Event()
+    pool = thread_pool(lambda name, args: release.wait(5), timeout=0.05)
+    assert pool.render("chart", (1,), "key", lambda: "inline") == "inline"
+    assert pool.stats()["timeouts"] == 1
+    release.set()
+
+
+def test_failed_build_falls_back_to_an_inline_build():
+    def target(name, args):
+        raise RuntimeError("broken builder")
+
+    pool = thread_pool(target)
+    assert pool.render("chart", (1,), "key", lambda: "inline") == "inline"
+    assert pool.stats()["failures"] == 1
+    assert pool.stats()["pending"] == 0
+
+
+def test_restart_drops_the_processes_and_pending_builds():
+    pool = thread_pool(lambda name, args: "built")
+    assert pool.render("chart", (1,), "key", lambda: "inline") == "built"
+    pool.restart()
+    assert pool._executor is None
+    assert pool.stats()["pending"] == 0
+
+
+def test_builds_in_worker_processes():
+    # target and arguments cross a process boundary, so both must pickle
+    pool = RenderPool(operator.getitem, 1, ["chart"])
+    try:
+        assert pool.render("abc", 1, "key", lambda: "inline") == "b"
+        assert pool.stats()["pooled"] == 1
+    finally:
+        pool.restart()